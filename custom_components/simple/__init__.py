@@ -6,9 +6,19 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import BASE_URL, DOMAIN
-from .thesimple import APIError, AuthError, TheSimpleClient
+from .const import (
+    BASE_URL,
+    CONF_MAX_REQUESTS,
+    DATA_FLOW_SESSIONS,
+    DEFAULT_MAX_REQUESTS,
+    DOMAIN,
+    TOKEN_RENEWAL_MARGIN,
+)
+from .coordinator import SimpleDataUpdateCoordinator
+from .store import SimpleMetadataStore, SimpleSessionStore
+from .thesimple import REQUEST_BURST, APIError, AsyncTheSimpleClient, AuthError
 
 _PLATFORMS: list[Platform] = [Platform.CLIMATE]
 
@@ -20,9 +30,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     username: str = entry.data[CONF_USERNAME]
     password: str = entry.data[CONF_PASSWORD]
 
-    client = TheSimpleClient(BASE_URL)
+    session_store = SimpleSessionStore(hass, entry)
+    max_requests = entry.options.get(CONF_MAX_REQUESTS, DEFAULT_MAX_REQUESTS)
+    client = AsyncTheSimpleClient(
+        BASE_URL,
+        async_get_clientsession(hass),
+        rate=max_requests / 60,
+        # A burst never exceeds what the option allows in a whole minute.
+        burst=min(REQUEST_BURST, max_requests),
+    )
+    client.token_listener = lambda: session_store.async_schedule_save(client)
     try:
-        await hass.async_add_executor_job(client.auth, username, password)
+        session = hass.data.get(DATA_FLOW_SESSIONS, {}).pop(username, None)
+        if session is None:
+            session = await session_store.async_load()
+        if client.restore_session(session, username, password):
+            # Skip the handshake; only renew a session that is about to expire.
+            expires_in = client.token_expires_in()
+            if (
+                expires_in is not None
+                and expires_in <= TOKEN_RENEWAL_MARGIN.total_seconds()
+            ):
+                await client.renewToken()
+        else:
+            await client.auth(username, password)
     except AuthError as err:
         raise ConfigEntryError("Invalid authentication") from err
     except APIError as err:
@@ -30,15 +61,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception as err:
         raise ConfigEntryNotReady("Unexpected error during setup") from err
 
-    hass.data[DOMAIN][entry.entry_id] = client
+    coordinator = SimpleDataUpdateCoordinator(hass, entry, client)
+    await coordinator.async_config_entry_first_refresh()
+    session_store.async_schedule_save(client)
+    entry.async_create_background_task(
+        hass, coordinator.async_prefetch_away_settings(), f"{DOMAIN} away settings"
+    )
+
+    hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored session and metadata of a deleted config entry."""
+    await SimpleSessionStore(hass, entry).async_remove()
+    await SimpleMetadataStore(hass, entry).async_remove()
@@ -1,9 +1,11 @@
 """The Simple WiFi Thermostat integration."""
 
+from collections.abc import Awaitable
 import logging
 from typing import Any
 
 from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
     FAN_AUTO,
     FAN_ON,
     PRESET_AWAY,
@@ -15,11 +17,13 @@ from homeassistant.components.climate import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, PRECISION_TENTHS, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .commands import ThermostatCommandQueue
 from .const import DOMAIN
-from .thesimple import APIError, AuthError, TheSimpleClient, TheSimpleError
+from .coordinator import SimpleDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,39 +34,53 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up simple thermostats from a config entry."""
-    client: TheSimpleClient = hass.data[DOMAIN][entry.entry_id]
+    coordinator: SimpleDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Discover thermostats (sync call, run in executor)
-    thermostat_ids = await hass.async_add_executor_job(client.getThermostatIds)
-    simple_thermostats = []
+    async_add_entities(
+        SimpleThermostat(coordinator, thermostat_obj)
+        for thermostat_obj in coordinator.data.values()
+    )
 
-    for thermostat_id in thermostat_ids:
-        # Create the thermostat object (sync call, run in executor)
-        thermostat_obj = await hass.async_add_executor_job(
-            client.createThermostat, thermostat_id
-        )
-        simple_thermostat = SimpleThermostat(thermostat_obj)
-        simple_thermostats.append(simple_thermostat)
-
-    async_add_entities(simple_thermostats)
-
-
-class SimpleThermostatError(Exception):
-    """Base exception class for SimpleThermostat errors."""
-
-
-class SimpleThermostatConfigError(SimpleThermostatError):
-    """Raised for configuration-related errors."""
 
-
-class SimpleThermostat(ClimateEntity):
+class SimpleThermostat(CoordinatorEntity[SimpleDataUpdateCoordinator], ClimateEntity):
     """Representation of an Simple thermostat."""
 
-    def __init__(self, thesimplethermostat: Any, name: str | None = None) -> None:
+    def __init__(
+        self,
+        coordinator: SimpleDataUpdateCoordinator,
+        thesimplethermostat: Any,
+        name: str | None = None,
+    ) -> None:
         """Initialize the SimpleThermostat entity."""
         _LOGGER.debug("Init Simple Thermostat class")
+        super().__init__(coordinator)
         self._thermostat = thesimplethermostat
         self._name = name
+        self._written_available: bool | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return if the last refresh of this thermostat succeeded."""
+        return (
+            super().available
+            and self._thermostat.thermostat_id not in self.coordinator.failed_ids
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if this thermostat or its availability changed."""
+        available = self.available
+        if (
+            self._thermostat.thermostat_id in self.coordinator.changed_ids
+            or available != self._written_available
+        ):
+            self._written_available = available
+            self.async_write_ha_state()
+
+    async def async_update(self) -> None:
+        """Refresh this thermostat on request, even while its polling backs off."""
+        self.coordinator.async_mark_due(self._thermostat.thermostat_id)
+        await super().async_update()
 
     @property
     def current_temperature(self) -> float | None:
@@ -192,71 +210,55 @@ class SimpleThermostat(ClimateEntity):
         """Return a unique ID for the thermostat."""
         return str(self._thermostat.thermostat_id)
 
+    @property
+    def _commands(self) -> ThermostatCommandQueue:
+        """Return the queue that serializes the writes to this thermostat."""
+        return self.coordinator.command_queue(self._thermostat.thermostat_id)
+
+    async def _async_set_state(self, **fields: Any) -> None:
+        """Apply state changes right away, send them and confirm them."""
+        self._thermostat.set_local_state(**fields)
+        await self._async_send(self._commands.async_set_state(**fields))
+
+    async def _async_send(self, command: Awaitable[None]) -> None:
+        """Show the local state, send a command and refresh until confirmed."""
+        self.async_write_ha_state()
+        try:
+            await command
+        except Exception:
+            self._thermostat.clear_expected_state()
+            raise
+        finally:
+            self.coordinator.async_confirm(self._thermostat.thermostat_id)
+
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set a target mode."""
-        await self.hass.async_add_executor_job(self._thermostat.set_mode, hvac_mode)
+        await self._async_set_state(hvac_mode=hvac_mode)
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set a target fan mode."""
-        await self.hass.async_add_executor_job(self._thermostat.set_fan_mode, fan_mode)
+        await self._async_set_state(fan_mode=fan_mode)
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set a target temperature."""
         _LOGGER.debug("Setting temperature")
         temperature = kwargs.get(ATTR_TEMPERATURE)
+        hvac_mode = kwargs.get(ATTR_HVAC_MODE)
         if temperature is None:
+            if hvac_mode is not None:
+                await self.async_set_hvac_mode(hvac_mode)
             return
 
+        # Mode and setpoint go out in a single request
         _LOGGER.debug("Setting current temp to %f", temperature)
-        await self.hass.async_add_executor_job(self._thermostat.set_temp, temperature)
+        fields = self._thermostat.setpoint_fields(temperature, hvac_mode) or {}
+        if hvac_mode is not None:
+            fields["hvac_mode"] = hvac_mode
+        if not fields:
+            return
+        await self._async_set_state(**fields)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set a preset mode."""
-        await self.hass.async_add_executor_job(
-            self._thermostat.set_preset_mode, preset_mode
-        )
-
-    async def async_update(self) -> None:
-        """Refresh the thermostat data from the API and handle retries on failure."""
-        _LOGGER.debug("Refreshing thermostat")
-
-        retries = 3
-        success = False
-
-        while retries > 0:
-            try:
-                await self.hass.async_add_executor_job(self._thermostat.refresh)
-                success = True
-                _LOGGER.debug("Thermostat data successfully refreshed")
-                break
-
-            except AuthError as ex:
-                _LOGGER.warning("Authentication error during refresh: %s", str(ex))
-                _LOGGER.debug("Attempting to refresh token")
-
-                try:
-                    await self.hass.async_add_executor_job(
-                        self._thermostat.client.getToken
-                    )
-                except AuthError as token_ex:
-                    _LOGGER.error(
-                        "Failed to refresh authentication token: %s", str(token_ex)
-                    )
-                    break
-
-            except APIError as ex:
-                _LOGGER.warning("API error during refresh: %s", str(ex))
-
-            except TheSimpleError as ex:
-                _LOGGER.error("TheSimple error: %s", str(ex))
-                break
-
-            except Exception as ex:  # noqa: BLE001
-                _LOGGER.error("Unexpected exception during refresh: %s", str(ex))
-                break
-
-            retries -= 1
-            _LOGGER.debug("Retrying... (%d attempts left)", retries)
-
-        if not success:
-            raise SimpleThermostatError("Refresh failed after three attempts.")
+        self._thermostat.set_local_preset_mode(preset_mode)
+        await self._async_send(self._commands.async_set_preset_mode(preset_mode))
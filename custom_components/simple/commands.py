@@ -0,0 +1,124 @@
+"""Per-thermostat command queue for The Simple WiFi Thermostat integration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import COMMAND_COALESCE_WINDOW, DOMAIN
+from .thesimple import AsyncTheSimpleThermostat
+
+_LOGGER = logging.getLogger(__name__)
+
+_STATE = "state"
+_PRESET = "preset"
+
+
+@dataclass
+class _Command:
+    """A pending write and the callers waiting for it."""
+
+    kind: str
+    fields: dict[str, Any]
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+class ThermostatCommandQueue:
+    """Serialize the writes to one thermostat and coalesce rapid changes.
+
+    Writes are held for a short window. Consecutive state writes are merged
+    into one request where the latest value of each field wins, and commands
+    of different kinds are sent in the order they were queued.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        thermostat: AsyncTheSimpleThermostat,
+        window: float = COMMAND_COALESCE_WINDOW,
+    ) -> None:
+        """Initialize the command queue of a thermostat."""
+        self._hass = hass
+        self._entry = entry
+        self._thermostat = thermostat
+        self._window = window
+        self._pending: list[_Command] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def async_set_state(self, **fields: Any) -> None:
+        """Queue a state write and wait until it has been sent.
+
+        Accepts the keyword arguments of AsyncTheSimpleThermostat.set_state.
+        """
+        await self._async_enqueue(_STATE, fields)
+
+    async def async_set_preset_mode(self, preset: str) -> None:
+        """Queue a preset change and wait until it has been sent."""
+        await self._async_enqueue(_PRESET, {"preset": preset})
+
+    async def _async_enqueue(self, kind: str, fields: dict[str, Any]) -> None:
+        """Merge a command into the queue and wait for its result."""
+        waiter: asyncio.Future[None] = self._hass.loop.create_future()
+
+        if self._pending and self._pending[-1].kind == kind:
+            command = self._pending[-1]
+            command.fields.update(fields)
+        else:
+            command = _Command(kind, dict(fields))
+            self._pending.append(command)
+        command.waiters.append(waiter)
+
+        if self._task is None:
+            self._task = self._entry.async_create_background_task(
+                self._hass,
+                self._async_run(),
+                f"{DOMAIN} commands {self._thermostat.thermostat_id}",
+            )
+
+        await waiter
+
+    async def _async_run(self) -> None:
+        """Send the queued commands one at a time."""
+        try:
+            while self._pending:
+                await asyncio.sleep(self._window)
+                command = self._pending.pop(0)
+                _LOGGER.debug(
+                    "Sending %s command to thermostat %s: %s",
+                    command.kind,
+                    self._thermostat.thermostat_id,
+                    command.fields,
+                )
+                try:
+                    if command.kind == _STATE:
+                        await self._thermostat.set_state(**command.fields)
+                    else:
+                        await self._thermostat.set_preset_mode(command.fields["preset"])
+                except Exception as err:  # noqa: BLE001
+                    _set_result(command.waiters, err)
+                else:
+                    _set_result(command.waiters, None)
+        finally:
+            self._task = None
+            # Only reached with commands left if the task was cancelled
+            for command in self._pending:
+                for waiter in command.waiters:
+                    waiter.cancel()
+            self._pending.clear()
+
+
+def _set_result(waiters: list[asyncio.Future[None]], err: Exception | None) -> None:
+    """Resolve the futures of the callers waiting on a command."""
+    for waiter in waiters:
+        if waiter.done():
+            continue
+        if err is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(err)
@@ -9,9 +9,23 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-
-from .const import BASE_URL, DOMAIN
-from .thesimple import APIError, AuthError, TheSimpleClient
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    BASE_URL,
+    CONF_MAX_REQUESTS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_TEMP_DEADBAND,
+    DATA_FLOW_SESSIONS,
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_TEMP_DEADBAND,
+    DOMAIN,
+)
+from .thesimple import APIError, AsyncTheSimpleClient, AuthError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +35,14 @@ class SimpleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SimpleOptionsFlow:
+        """Return the options flow for this handler."""
+        return SimpleOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
@@ -35,9 +57,9 @@ class SimpleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(username)
             self._abort_if_unique_id_configured()
 
-            client = TheSimpleClient(BASE_URL)
+            client = AsyncTheSimpleClient(BASE_URL, async_get_clientsession(self.hass))
             try:
-                await self.hass.async_add_executor_job(client.auth, username, password)
+                await client.auth(username, password)
             except AuthError:
                 errors["base"] = "invalid_auth"
             except APIError:
@@ -47,6 +69,9 @@ class SimpleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
 
             if not errors:
+                # Hand the session to entry setup so it skips a second handshake.
+                sessions = self.hass.data.setdefault(DATA_FLOW_SESSIONS, {})
+                sessions[username] = client.export_session()
                 return self.async_create_entry(
                     title=username,
                     data={
@@ -71,3 +96,50 @@ class SimpleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_PASSWORD): str,
             }
         )
+
+
+class SimpleOptionsFlow(config_entries.OptionsFlow):
+    """Handle the polling and update options of The Simple Thermostat."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the polling intervals, temperature deadband and request rate."""
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_scan_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_TEMP_DEADBAND,
+                    default=options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Required(
+                    CONF_MAX_REQUESTS,
+                    default=options.get(CONF_MAX_REQUESTS, DEFAULT_MAX_REQUESTS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=6, max=600)),
+            }
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            errors=errors,
+        )
@@ -1,4 +1,57 @@
 """Constants for The Simple WiFi Thermostat integration."""
 
+from datetime import timedelta
+
 BASE_URL = "https://my.ecofactor.com/ws/v1.0/"
 DOMAIN = "simple"
+
+# Sessions authenticated by the config flow, keyed by username, waiting to be
+# picked up by the setup of the entry the flow creates.
+DATA_FLOW_SESSIONS = f"{DOMAIN}_flow_sessions"
+
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=60)
+
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MIN_SCAN_INTERVAL = 30
+DEFAULT_MAX_SCAN_INTERVAL = 300
+
+# Changes of the current temperature smaller than this are not written to the
+# state machine.
+CONF_TEMP_DEADBAND = "temperature_deadband"
+DEFAULT_TEMP_DEADBAND = 0.0
+
+# Requests the account may send to the API per minute, shared by polls, writes
+# and authentication.
+CONF_MAX_REQUESTS = "max_requests_per_minute"
+DEFAULT_MAX_REQUESTS = 120
+
+# Thermostats are polled at the minimum interval while heating or cooling and
+# for this long after a write. Idle ones double their interval (up to the
+# maximum) for every poll without a change, at most MAX_STABLE_POLLS times.
+ACTIVE_HVAC_STATES = ("cool", "heat")
+ACTIVE_AFTER_WRITE = timedelta(minutes=5)
+MAX_STABLE_POLLS = 4
+# Thermostats due within this many seconds are polled together.
+POLL_BATCH_WINDOW = 5
+UPDATE_RETRIES = 3
+# Failed refreshes are only retried within an update while the backoff of the
+# client is shorter than this (seconds); longer waits are left to the next poll.
+MAX_RETRY_DELAY = 30
+DEFAULT_DISCOVERY_CONCURRENCY = 8
+TOKEN_RENEWAL_MARGIN = timedelta(minutes=2)
+TOKEN_RENEWAL_RETRY = timedelta(minutes=1)
+
+STORAGE_VERSION = 1
+SESSION_SAVE_DELAY = 10
+
+# Bump when the cached metadata format changes to discard old caches.
+METADATA_CACHE_VERSION = 1
+METADATA_REVALIDATE_INTERVAL = timedelta(hours=24)
+
+# Writes to a thermostat are held this long (seconds) so rapid changes such as
+# dragging the setpoint slider are merged into a single request.
+COMMAND_COALESCE_WINDOW = 0.5
+
+# Delays (seconds) between the refreshes that confirm a write was applied.
+CONFIRM_REFRESH_DELAYS = (2, 4, 8, 16)
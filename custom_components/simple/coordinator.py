@@ -0,0 +1,497 @@
+"""Data update coordinator for The Simple WiFi Thermostat integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .commands import ThermostatCommandQueue
+from .const import (
+    ACTIVE_AFTER_WRITE,
+    ACTIVE_HVAC_STATES,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_TEMP_DEADBAND,
+    CONFIRM_REFRESH_DELAYS,
+    DEFAULT_DISCOVERY_CONCURRENCY,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TEMP_DEADBAND,
+    DOMAIN,
+    MAX_RETRY_DELAY,
+    MAX_STABLE_POLLS,
+    METADATA_REVALIDATE_INTERVAL,
+    POLL_BATCH_WINDOW,
+    TOKEN_RENEWAL_MARGIN,
+    TOKEN_RENEWAL_RETRY,
+    UPDATE_RETRIES,
+)
+from .store import SimpleMetadataStore
+from .thesimple import (
+    APIError,
+    APITimeoutError,
+    AsyncTheSimpleClient,
+    AsyncTheSimpleThermostat,
+    AuthError,
+    TheSimpleError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SimpleDataUpdateCoordinator(
+    DataUpdateCoordinator[dict[int, AsyncTheSimpleThermostat]]
+):
+    """Refresh every thermostat of an account in a single update cycle."""
+
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: AsyncTheSimpleClient,
+        discovery_concurrency: int = DEFAULT_DISCOVERY_CONCURRENCY,
+    ) -> None:
+        """Initialize the coordinator for the given config entry and client.
+
+        discovery_concurrency caps how many thermostats are loaded at once
+        during setup.
+        """
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=DOMAIN,
+            update_interval=DEFAULT_SCAN_INTERVAL,
+        )
+        self.client = client
+        self.thermostats: dict[int, AsyncTheSimpleThermostat] = {}
+        self.failed_ids: set[int] = set()
+        # Thermostats whose state changed since listeners were last notified
+        self.changed_ids: set[int] = set()
+        self._discovery_concurrency = max(1, discovery_concurrency)
+        self._unsub_token_renewal: Callable[[], None] | None = None
+        self._metadata_store = SimpleMetadataStore(hass, entry)
+        self._command_queues: dict[int, ThermostatCommandQueue] = {}
+        self._confirm_tasks: dict[int, asyncio.Task[None]] = {}
+        self._min_interval = float(
+            entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+        )
+        self._max_interval = max(
+            self._min_interval,
+            float(entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)),
+        )
+        self._next_poll: dict[int, float] = {}
+        self._last_write: dict[int, float] = {}
+        self._stable_polls: dict[int, int] = {}
+        self._temp_deadband = float(
+            entry.options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)
+        )
+
+    async def _async_setup(self) -> None:
+        """Build the thermostats from cached metadata, or discover them."""
+        self.thermostats = await self._async_load_cached_thermostats()
+        if not self.thermostats:
+            try:
+                self.thermostats = await self._async_discover()
+            except TheSimpleError as err:
+                raise UpdateFailed(f"Unable to discover thermostats: {err}") from err
+            await self._metadata_store.async_save(self.thermostats.values())
+        elif self._metadata_store.is_stale:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_revalidate_metadata(),
+                f"{DOMAIN} metadata revalidation",
+            )
+        else:
+            # Pick up thermostats added to or removed from the account since
+            # the cache was written without delaying setup.
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_sync_thermostats(),
+                f"{DOMAIN} thermostat sync",
+            )
+
+        for thermostat in self.thermostats.values():
+            thermostat.current_temp_deadband = self._temp_deadband
+
+        self.config_entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self._async_revalidate_metadata,
+                METADATA_REVALIDATE_INTERVAL,
+            )
+        )
+
+    async def async_prefetch_away_settings(self) -> None:
+        """Fill the away settings cache of every location ahead of preset changes."""
+        for thermostat in self.thermostats.values():
+            try:
+                await thermostat.get_away_settings()
+            except TheSimpleError as err:
+                _LOGGER.debug("Unable to prefetch away settings: %s", err)
+                return
+
+    async def _async_load_cached_thermostats(
+        self,
+    ) -> dict[int, AsyncTheSimpleThermostat]:
+        """Return the thermostats built from cached metadata without any request."""
+        thermostats: dict[int, AsyncTheSimpleThermostat] = {}
+        for cached in await self._metadata_store.async_load() or []:
+            try:
+                thermostat = AsyncTheSimpleThermostat(
+                    self.client, cached["thermostat_id"], cached["location_id"]
+                )
+                thermostat.restore_metadata(cached["metadata"])
+            except (KeyError, TypeError, TheSimpleError) as err:
+                _LOGGER.debug("Ignoring cached thermostat metadata: %s", err)
+                return {}
+            thermostats[thermostat.thermostat_id] = thermostat
+        return thermostats
+
+    async def _async_revalidate_metadata(self, _now: datetime | None = None) -> None:
+        """Refresh the cached metadata and pick up added or removed thermostats."""
+        try:
+            discovered = await self._async_discover()
+        except TheSimpleError as err:
+            _LOGGER.warning("Unable to revalidate thermostat metadata: %s", err)
+            return
+
+        await self._metadata_store.async_save(discovered.values())
+
+        locations = {tid: t.location_id for tid, t in discovered.items()}
+        if locations != {tid: t.location_id for tid, t in self.thermostats.items()}:
+            _LOGGER.info("Thermostats of the account changed, reloading")
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+            return
+
+        for thermostat_id, thermostat in discovered.items():
+            self.thermostats[thermostat_id].restore_metadata(thermostat.metadata)
+        self.changed_ids = set(self.thermostats)
+        self.async_update_listeners()
+
+    async def _async_sync_thermostats(self) -> None:
+        """Pick up added or removed thermostats, keeping the cached metadata.
+
+        Only the thermostat lists of the locations are requested, plus the
+        metadata of thermostats that are not cached yet.
+        """
+        try:
+            locations = await self.client.getThermostatLocations()
+            if locations == {tid: t.location_id for tid, t in self.thermostats.items()}:
+                return
+            added = await self._async_load_metadata(
+                {
+                    tid: location_id
+                    for tid, location_id in locations.items()
+                    if tid not in self.thermostats
+                }
+            )
+        except TheSimpleError as err:
+            _LOGGER.warning("Unable to list the thermostats of the account: %s", err)
+            return
+
+        thermostats: dict[int, AsyncTheSimpleThermostat] = {}
+        for thermostat_id, location_id in locations.items():
+            if (thermostat := added.get(thermostat_id)) is None:
+                thermostat = AsyncTheSimpleThermostat(
+                    self.client, thermostat_id, location_id
+                )
+                thermostat.restore_metadata(self.thermostats[thermostat_id].metadata)
+            thermostats[thermostat_id] = thermostat
+        # The cached metadata was not fetched again, so it keeps its age.
+        await self._metadata_store.async_save(
+            thermostats.values(), self._metadata_store.updated_at
+        )
+
+        _LOGGER.info("Thermostats of the account changed, reloading")
+        self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
+    async def _async_discover(self) -> dict[int, AsyncTheSimpleThermostat]:
+        """Discover the thermostats of every location and load their metadata."""
+        # The client renews a revoked or expired token and replays the request.
+        return await self._async_load_metadata(
+            await self.client.getThermostatLocations()
+        )
+
+    async def _async_load_metadata(
+        self, locations: dict[int, int]
+    ) -> dict[int, AsyncTheSimpleThermostat]:
+        """Load the metadata of the thermostats mapped to their location IDs."""
+        semaphore = asyncio.Semaphore(self._discovery_concurrency)
+
+        async def load(
+            thermostat_id: int, location_id: int
+        ) -> AsyncTheSimpleThermostat:
+            thermostat = AsyncTheSimpleThermostat(
+                self.client, thermostat_id, location_id
+            )
+            async with semaphore:
+                await thermostat.get_metadata()
+            return thermostat
+
+        thermostats = await asyncio.gather(
+            *(load(tid, location_id) for tid, location_id in locations.items())
+        )
+
+        return {thermostat.thermostat_id: thermostat for thermostat in thermostats}
+
+    async def _async_update_data(self) -> dict[int, AsyncTheSimpleThermostat]:
+        """Refresh the thermostats that are due, re-authenticating and retrying on failure."""
+        now = time.monotonic()
+        due = [
+            thermostat
+            for thermostat_id, thermostat in self.thermostats.items()
+            if self._next_poll.get(thermostat_id, now) <= now + POLL_BATCH_WINDOW
+        ]
+        pending = due
+        errors: dict[int, Exception] = {}
+        changed: set[int] = set()
+        self.changed_ids = changed
+
+        for attempt in range(UPDATE_RETRIES):
+            results = await asyncio.gather(
+                *(thermostat.refresh() for thermostat in pending),
+                return_exceptions=True,
+            )
+            failed: dict[int, Exception] = {}
+            for thermostat, result in zip(pending, results, strict=True):
+                if isinstance(result, Exception):
+                    failed[thermostat.thermostat_id] = result
+                else:
+                    errors.pop(thermostat.thermostat_id, None)
+                    if result:
+                        changed.add(thermostat.thermostat_id)
+            errors.update(failed)
+            if not failed:
+                break
+
+            unexpected = [
+                err for err in failed.values() if not isinstance(err, TheSimpleError)
+            ]
+            if unexpected:
+                raise UpdateFailed(
+                    f"Unexpected exception during refresh: {unexpected[0]}"
+                ) from unexpected[0]
+
+            if all(isinstance(err, APITimeoutError) for err in failed.values()) and (
+                len(failed) == len(pending)
+            ):
+                # The API is stalled, retrying would only hold up the update.
+                _LOGGER.debug("Every refresh timed out, not retrying")
+                break
+
+            # The client already tried to renew a rejected token, so the
+            # credentials are wrong. Sending them again risks locking the
+            # account, so stop polling until the entry is reloaded.
+            auth_errors = [err for err in failed.values() if isinstance(err, AuthError)]
+            if auth_errors:
+                self.update_interval = None
+                self._cancel_token_renewal()
+                raise ConfigEntryError(
+                    f"Invalid authentication: {auth_errors[0]}"
+                ) from auth_errors[0]
+
+            # A missing thermostat, a malformed response or another client
+            # error fails the same way again, so only transient errors are
+            # retried.
+            pending = [
+                thermostat
+                for thermostat in pending
+                if isinstance(err := failed.get(thermostat.thermostat_id), APIError)
+                and err.transient
+            ]
+            if not pending or attempt + 1 == UPDATE_RETRIES:
+                break
+            delay = self.client.retry_delay()
+            if delay > MAX_RETRY_DELAY:
+                _LOGGER.debug("API backing off for %.0f seconds, not retrying", delay)
+                break
+
+            _LOGGER.debug(
+                "Retrying %d thermostats in %.1f seconds... (%d attempts left)",
+                len(pending),
+                delay,
+                UPDATE_RETRIES - attempt - 1,
+            )
+            await asyncio.sleep(delay)
+
+        self.changed_ids = changed
+        self.failed_ids.difference_update(t.thermostat_id for t in due)
+        self.failed_ids.update(errors)
+        if errors and self.failed_ids.issuperset(self.thermostats):
+            # Every thermostat is failing, so the API or the account is the
+            # problem. Do not poll again before the client is ready to send
+            # requests. Otherwise only the failing thermostats are unavailable.
+            delay = self.client.retry_delay()
+            if self.update_interval is None or (
+                delay > self.update_interval.total_seconds()
+            ):
+                self.update_interval = timedelta(seconds=delay)
+            err = next(iter(errors.values()))
+            raise UpdateFailed(f"Refresh failed after {attempt + 1} attempts: {err}")
+        for thermostat_id, err in errors.items():
+            _LOGGER.warning("Unable to refresh thermostat %s: %s", thermostat_id, err)
+
+        self._schedule_polls(due, changed)
+        self._schedule_token_renewal()
+        return self.thermostats
+
+    def _schedule_polls(
+        self, polled: list[AsyncTheSimpleThermostat], changed: set[int]
+    ) -> None:
+        """Set when the polled thermostats are due next and when to wake up."""
+        now = time.monotonic()
+        for thermostat in polled:
+            thermostat_id = thermostat.thermostat_id
+            if thermostat_id in changed:
+                self._stable_polls[thermostat_id] = 0
+            elif thermostat_id not in self.failed_ids:
+                stable = self._stable_polls.get(thermostat_id, 0) + 1
+                self._stable_polls[thermostat_id] = min(stable, MAX_STABLE_POLLS)
+            self._next_poll[thermostat_id] = now + self._poll_interval(thermostat)
+
+        next_poll = min(self._next_poll.values(), default=now + self._min_interval)
+        self.update_interval = timedelta(
+            seconds=max(self._min_interval, next_poll - now)
+        )
+
+    def _poll_interval(self, thermostat: AsyncTheSimpleThermostat) -> float:
+        """Return how many seconds to wait before polling a thermostat again.
+
+        Active thermostats and thermostats that were just written to are polled
+        at the minimum interval, disconnected ones at the maximum. Idle ones
+        back off from the default interval while their state stays the same.
+        """
+        thermostat_id = thermostat.thermostat_id
+        last_write = self._last_write.get(thermostat_id)
+        if thermostat.hvacState in ACTIVE_HVAC_STATES or (
+            last_write is not None
+            and time.monotonic() - last_write < ACTIVE_AFTER_WRITE.total_seconds()
+        ):
+            return self._min_interval
+        if thermostat.connected is False:
+            return self._max_interval
+
+        base = min(
+            max(DEFAULT_SCAN_INTERVAL.total_seconds(), self._min_interval),
+            self._max_interval,
+        )
+        stable = self._stable_polls.get(thermostat_id, 0)
+        return min(base * 2**stable, self._max_interval)
+
+    def command_queue(self, thermostat_id: int) -> ThermostatCommandQueue:
+        """Return the command queue that serializes writes to a thermostat."""
+        if thermostat_id not in self._command_queues:
+            self._command_queues[thermostat_id] = ThermostatCommandQueue(
+                self.hass, self.config_entry, self.thermostats[thermostat_id]
+            )
+        return self._command_queues[thermostat_id]
+
+    @callback
+    def async_mark_due(self, thermostat_id: int) -> None:
+        """Poll a thermostat on the next refresh, however far its backoff got."""
+        self._next_poll[thermostat_id] = time.monotonic()
+
+    @callback
+    def async_confirm(self, thermostat_id: int) -> None:
+        """Refresh one thermostat with short backoff until it reports the last write."""
+        # Poll the thermostat closely for a while after the write
+        now = time.monotonic()
+        self._last_write[thermostat_id] = now
+        self._stable_polls[thermostat_id] = 0
+        next_poll = now + self._min_interval
+        if next_poll < self._next_poll.get(thermostat_id, next_poll):
+            self._next_poll[thermostat_id] = next_poll
+            if self.update_interval is None or (
+                self.update_interval.total_seconds() > self._min_interval
+            ):
+                self.update_interval = timedelta(seconds=self._min_interval)
+                self._schedule_refresh()
+
+        if (task := self._confirm_tasks.pop(thermostat_id, None)) is not None:
+            task.cancel()
+        self._confirm_tasks[thermostat_id] = (
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_confirm(self.thermostats[thermostat_id]),
+                f"{DOMAIN} confirm {thermostat_id}",
+            )
+        )
+
+    async def _async_confirm(self, thermostat: AsyncTheSimpleThermostat) -> None:
+        """Refresh a thermostat until its local changes are confirmed."""
+        thermostat_id = thermostat.thermostat_id
+        try:
+            for delay in CONFIRM_REFRESH_DELAYS:
+                await asyncio.sleep(delay)
+                try:
+                    changed = await thermostat.refresh()
+                except TheSimpleError as err:
+                    _LOGGER.debug(
+                        "Confirmation refresh of %s failed: %s", thermostat_id, err
+                    )
+                    continue
+                if changed or thermostat_id in self.failed_ids:
+                    self.failed_ids.discard(thermostat_id)
+                    self.changed_ids = {thermostat_id}
+                    self.async_update_listeners()
+                if not thermostat.pending_confirmation:
+                    return
+        finally:
+            if self._confirm_tasks.get(thermostat_id) is asyncio.current_task():
+                del self._confirm_tasks[thermostat_id]
+
+    async def async_shutdown(self) -> None:
+        """Cancel the scheduled token renewal and shut down the coordinator."""
+        self._cancel_token_renewal()
+        await super().async_shutdown()
+
+    @callback
+    def _schedule_token_renewal(self, delay: float | None = None) -> None:
+        """Schedule a background token renewal ahead of the token expiry."""
+        if self._unsub_token_renewal is not None:
+            return
+        if delay is None:
+            expires_in = self.client.token_expires_in()
+            if expires_in is None:
+                return
+            delay = max(0.0, expires_in - TOKEN_RENEWAL_MARGIN.total_seconds())
+
+        _LOGGER.debug("Scheduling token renewal in %.0f seconds", delay)
+        self._unsub_token_renewal = async_call_later(
+            self.hass, delay, self._async_renew_token
+        )
+
+    @callback
+    def _cancel_token_renewal(self) -> None:
+        """Cancel a pending background token renewal."""
+        if self._unsub_token_renewal is not None:
+            self._unsub_token_renewal()
+            self._unsub_token_renewal = None
+
+    async def _async_renew_token(self, _now: datetime) -> None:
+        """Renew the access token so polls never run into an expired token."""
+        self._unsub_token_renewal = None
+        try:
+            await self.client.renewToken()
+        except AuthError as err:
+            # Retrying rejected credentials risks locking the account.
+            _LOGGER.error("Background token renewal rejected: %s", err)
+            return
+        except TheSimpleError as err:
+            _LOGGER.warning("Background token renewal failed: %s", err)
+            self._schedule_token_renewal(TOKEN_RENEWAL_RETRY.total_seconds())
+            return
+        self._schedule_token_renewal()
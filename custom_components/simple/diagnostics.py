@@ -0,0 +1,31 @@
+"""Diagnostics support for The Simple WiFi Thermostat integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SimpleDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the polling and API request state of a config entry."""
+    coordinator: SimpleDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    return {
+        "options": dict(entry.options),
+        "thermostats": len(coordinator.thermostats),
+        "failed_thermostats": sorted(coordinator.failed_ids),
+        "update_interval": (
+            coordinator.update_interval.total_seconds()
+            if coordinator.update_interval is not None
+            else None
+        ),
+        "retry_delay": client.retry_delay(),
+        "rate_limit": client.rate_limit_stats(),
+    }
@@ -0,0 +1,120 @@
+"""Persistent storage for The Simple WiFi Thermostat integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    METADATA_CACHE_VERSION,
+    METADATA_REVALIDATE_INTERVAL,
+    SESSION_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .thesimple import AsyncTheSimpleClient, AsyncTheSimpleThermostat
+
+
+class SimpleSessionStore:
+    """Keep the auth session of a config entry across Home Assistant restarts.
+
+    The session is stored as is in a private storage file, readable only by
+    the Home Assistant user, like the credentials of the config entry itself.
+    It is not encrypted, so anyone who can read the storage directory can use
+    the access and refresh tokens.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the session store for the given config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.session", private=True
+        )
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the stored session, or return None if there is none.
+
+        The client rejects a session it cannot restore, such as one saved in
+        an older format.
+        """
+        return await self._store.async_load() or None
+
+    def async_schedule_save(self, client: AsyncTheSimpleClient) -> None:
+        """Save the current session of the client after a short delay."""
+        self._store.async_delay_save(
+            lambda: client.export_session() or {}, SESSION_SAVE_DELAY
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored session."""
+        await self._store.async_remove()
+
+
+class SimpleMetadataStore:
+    """Cache the thermostat metadata of a config entry on disk.
+
+    Metadata rarely changes, so entities are built from the cache at startup.
+    The thermostat IDs of the account are checked in the background, and the
+    metadata itself is fetched again once the cache is stale.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the metadata store for the given config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.metadata"
+        )
+        self.updated_at: float | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Return if the cached metadata is due for revalidation."""
+        if self.updated_at is None:
+            return True
+        age = time.time() - self.updated_at
+        return age > METADATA_REVALIDATE_INTERVAL.total_seconds()
+
+    async def async_load(self) -> list[dict[str, Any]] | None:
+        """Load the cached thermostats, or return None if there is no usable cache.
+
+        Each cached thermostat is a dict with thermostat_id, location_id and
+        metadata keys.
+        """
+        data = await self._store.async_load()
+        if not data or data.get("version") != METADATA_CACHE_VERSION:
+            return None
+        self.updated_at = data.get("updated_at")
+        return data.get("thermostats") or None
+
+    async def async_save(
+        self,
+        thermostats: Iterable[AsyncTheSimpleThermostat],
+        updated_at: float | None = None,
+    ) -> None:
+        """Save the metadata of the given thermostats.
+
+        updated_at is when the oldest of the metadata was fetched from the
+        API, now by default.
+        """
+        self.updated_at = time.time() if updated_at is None else updated_at
+        await self._store.async_save(
+            {
+                "version": METADATA_CACHE_VERSION,
+                "updated_at": self.updated_at,
+                "thermostats": [
+                    {
+                        "thermostat_id": thermostat.thermostat_id,
+                        "location_id": thermostat.location_id,
+                        "metadata": thermostat.metadata,
+                    }
+                    for thermostat in thermostats
+                ],
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached metadata."""
+        await self._store.async_remove()
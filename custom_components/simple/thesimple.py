@@ -1,17 +1,34 @@
 """TheSimple/Ecofactor library."""
 
+import asyncio
 import base64
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextlib
+import contextvars
+from dataclasses import dataclass, field, fields, replace
+import email.utils
+import functools
 import hashlib
+import inspect
+import json
 import logging
 import random
 import re
+import threading
 import time
 
+import aiohttp
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 from cryptography.hazmat.primitives.serialization import load_pem_public_key
 import requests
 
+try:
+    import orjson
+except ImportError:  # Decoding falls back to the json module
+    orjson = None
+
 from homeassistant.components.climate import (
     FAN_AUTO,
     FAN_ON,
@@ -31,94 +48,910 @@ HTTP_FORBIDDEN_END = 401
 MAX_TEMP_DEFAULT = 89
 MIN_TEMP_DEFAULT = 50
 
+HTTP_METHODS = ("GET", "PATCH", "PUT", "DELETE")
+
+REFRESH_TOKEN_URL = "authenticate/refresh_token"
+
+# Tokens rejected sooner than this were revoked rather than expired, so their
+# age is not used to learn the token lifetime.
+MIN_TOKEN_LIFETIME = 300
+
+# Upper bound on worker threads the blocking client uses for parallel requests.
+MAX_WORKERS = 8
+
+# How long (seconds) locally applied changes are kept over refreshed state while
+# waiting for the thermostat to report them.
+OPTIMISTIC_STATE_TIMEOUT = 120
+
+# How long (seconds) the away settings of a location are reused.
+AWAY_SETTINGS_TTL = 900
+
+# How long a downloaded public key is reused for handshakes against the same API.
+PUBLIC_KEY_TTL = 3600
+# A login rejected with a cached key younger than this (seconds) is not retried
+# with a fresh key, so a wrong password does not cost two failed logins.
+PUBLIC_KEY_RETRY_AGE = 300
+
+THERMOSTAT_DATA = "best_known_current_state_thermostat_data"
+
+# Connect and read timeouts (seconds) of a single request by endpoint class.
+ENDPOINT_AUTH = "auth"
+ENDPOINT_READ = "read"
+ENDPOINT_WRITE = "write"
+REQUEST_TIMEOUTS = {
+    ENDPOINT_AUTH: (5, 15),
+    ENDPOINT_READ: (5, 15),
+    ENDPOINT_WRITE: (5, 20),
+}
+
+# Total time (seconds) an operation may spend on all of its requests.
+AUTH_DEADLINE = 60
+REFRESH_DEADLINE = 30
+WRITE_DEADLINE = 45
+
+# Failed requests are retried after BACKOFF_BASE * 2**(failures - 1) seconds,
+# with jitter and at most BACKOFF_MAX. After BREAKER_THRESHOLD consecutive
+# failures requests fail fast for a backoff that starts over from BACKOFF_BASE.
+BACKOFF_BASE = 2
+BACKOFF_MAX = 300
+BREAKER_THRESHOLD = 5
+# Longest Retry-After (seconds) from the server that is honored.
+RETRY_AFTER_MAX = 3600
+HTTP_CLIENT_ERROR_START = 400
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR_START = 500
+
+# Requests of an account are spaced out to REQUEST_RATE per second on average,
+# with bursts of up to REQUEST_BURST so discovery and a round of polls of a
+# typical account go out at once. Authentication and writes are sent ahead of
+# queued reads, and time spent queued does not count against deadlines.
+REQUEST_RATE = 2.0
+REQUEST_BURST = 30
+_REQUEST_PRIORITIES = {ENDPOINT_AUTH: 0, ENDPOINT_WRITE: 0, ENDPOINT_READ: 1}
+
+# How long (seconds) the result of an authenticated GET is reused for the same
+# URL. Writes discard reused results.
+READ_REUSE_WINDOW = 2
+
+# Payloads in log messages and exceptions are cut off after this many characters.
+MAX_LOGGED_PAYLOAD = 1024
+# Values of these payload fields and headers are never logged.
+REDACTED_FIELDS = frozenset(
+    {"access_token", "refresh_token", "password", "authorization", "encryptedpass"}
+)
+_REDACTED = "**REDACTED**"
+_REDACT_PATTERN = re.compile(
+    r'("(?:' + "|".join(sorted(REDACTED_FIELDS)) + r')"\s*:\s*)"(?:[^"\\]|\\.)*"',
+    re.IGNORECASE,
+)
+
+_public_key_cache = {}
+_public_key_lock = threading.Lock()
+
 
 class TheSimpleError(Exception):
     """Base exception for TheSimple/Ecofactor errors."""
 
 
 class APIError(TheSimpleError):
-    """Exception raised for API errors in TheSimple integration."""
+    """Exception raised for API errors in TheSimple integration.
+
+    transient is True for the failures the circuit breaker counts, which may
+    succeed when retried later: timeouts, connection errors, rate limiting and
+    server errors. Other errors, such as a missing resource or a malformed
+    response, fail the same way every time.
+    """
+
+    def __init__(self, message, transient=False) -> None:
+        """Initialize the error with its message and whether it is transient."""
+        super().__init__(message)
+        self.transient = transient
 
 
 class AuthError(TheSimpleError):
     """Exception raised for authentication errors in TheSimple integration."""
 
 
-class TheSimpleClient:
-    """Client for interacting with TheSimple/Ecofactor API."""
+class SchemaError(APIError):
+    """Exception raised when an API response does not have the expected shape."""
+
+
+class APITimeoutError(APIError):
+    """Exception raised when a request or operation runs out of time."""
+
+    def __init__(self, message) -> None:
+        """Initialize the error with its message."""
+        super().__init__(message, transient=True)
+
+
+class CircuitOpenError(APIError):
+    """Exception raised instead of sending a request while the API is failing."""
+
+    def __init__(self, message, retry_after) -> None:
+        """Initialize the error with the seconds until requests are let through."""
+        super().__init__(message, transient=True)
+        self.retry_after = retry_after
+
+
+class _Deadline:
+    """Monotonic time by which an operation has to finish."""
+
+    __slots__ = ("at", "parent")
+
+    def __init__(self, at, parent) -> None:
+        """Initialize a deadline nested in the deadline of the enclosing operation."""
+        self.at = at
+        self.parent = parent
+
+    def extend(self, seconds):
+        """Push this deadline and the ones enclosing it back."""
+        deadline = self
+        while deadline is not None:
+            deadline.at += seconds
+            deadline = deadline.parent
+
+
+# Deadline of the running operation, if any.
+_deadline = contextvars.ContextVar("thesimple_deadline", default=None)
+
+
+@contextlib.contextmanager
+def _operation_deadline(seconds):
+    """Limit the total time of the requests made inside the block.
+
+    Nested deadlines can only shorten the deadline of the enclosing operation.
+    """
+    current = _deadline.get()
+    at = time.monotonic() + seconds
+    if current is not None:
+        at = min(at, current.at)
+    token = _deadline.set(_Deadline(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _with_deadline(seconds):
+    """Decorate a method so all of its requests share an operation deadline."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _operation_deadline(seconds):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _operation_deadline(seconds):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _time_left():
+    """Return the seconds left before the operation deadline, or None outside one.
+
+    Raises:
+        APITimeoutError: If the operation deadline has already passed.
+
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    remaining = deadline.at - time.monotonic()
+    if remaining <= 0:
+        raise APITimeoutError("Operation deadline exceeded")
+    return remaining
+
+
+def _extend_deadline(seconds):
+    """Give the running operation more time for a wait that is not the API's fault."""
+    deadline = _deadline.get()
+    if deadline is not None:
+        deadline.extend(seconds)
+
+
+def _request_timeout(endpoint):
+    """Return the connect, read and total timeouts of a request.
+
+    The timeouts are cut to the time left before the operation deadline, and
+    total is None outside of an operation.
+
+    Raises:
+        APITimeoutError: If the operation deadline has already passed.
+
+    """
+    connect, read = REQUEST_TIMEOUTS[endpoint]
+    remaining = _time_left()
+    if remaining is None:
+        return connect, read, None
+    return min(connect, remaining), min(read, remaining), remaining
+
+
+def _endpoint(method, authenticated):
+    """Return the endpoint class of a request."""
+    if not authenticated:
+        return ENDPOINT_AUTH
+    if method == "GET":
+        return ENDPOINT_READ
+    return ENDPOINT_WRITE
+
+
+def _parse_retry_after(value):
+    """Return the seconds to wait from a Retry-After header, or None."""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        delay = retry_at.timestamp() - time.time()
+    return min(max(delay, 0.0), RETRY_AFTER_MAX)
+
+
+def _is_transient_status(status):
+    """Return whether an HTTP error status may not recur when retried later."""
+    return status == HTTP_TOO_MANY_REQUESTS or status >= HTTP_SERVER_ERROR_START
+
+
+class _CircuitBreaker:
+    """Back off from the API of an account while its requests keep failing.
+
+    Timeouts, connection errors, rate limiting and server errors count as
+    failures. Once BREAKER_THRESHOLD of them happen in a row the circuit opens
+    and requests fail fast with CircuitOpenError until the backoff has passed.
+    Then a single request is let through as a probe: a success closes the
+    circuit and a failure opens it again for longer. A Retry-After sent by the
+    server holds requests back even before the threshold is reached.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed circuit."""
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = None
+        self._probing = False
+
+    def retry_delay(self):
+        """Return how many seconds to wait before retrying a failed request."""
+        with self._lock:
+            if self._open_until is not None:
+                return max(self._open_until - time.monotonic(), 0.0)
+            return self._backoff(self._failures)
+
+    def before_request(self):
+        """Check that a request may be sent, returning whether it is a probe.
+
+        Raises:
+            CircuitOpenError: If requests are being held back.
+
+        """
+        with self._lock:
+            if self._open_until is None:
+                return False
+            remaining = self._open_until - time.monotonic()
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(
+                    "API requests suspended after repeated failures, "
+                    f"retrying in {max(remaining, 0):.0f} seconds",
+                    max(remaining, 0.0),
+                )
+            self._probing = True
+            return True
+
+    def record_response(self, status, retry_after=None):
+        """Record the HTTP status of a response that was received."""
+        if _is_transient_status(status):
+            self.record_failure(_parse_retry_after(retry_after))
+            return
+        with self._lock:
+            if self._failures:
+                _LOGGER.debug("API requests succeed again")
+            self._failures = 0
+            self._open_until = None
+            self._probing = False
+
+    def record_failure(self, retry_after=None):
+        """Record a failed request, opening the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            delay = None
+            if self._failures >= BREAKER_THRESHOLD:
+                delay = self._backoff(self._failures - BREAKER_THRESHOLD + 1)
+            if retry_after is not None:
+                delay = max(delay or 0.0, retry_after)
+            if delay is not None:
+                _LOGGER.debug(
+                    "Holding back API requests for %.0f seconds after %d failures",
+                    delay,
+                    self._failures,
+                )
+                self._open_until = time.monotonic() + delay
+
+    def release_probe(self):
+        """Let another request probe the API after a probe ended without result."""
+        with self._lock:
+            self._probing = False
+
+    @staticmethod
+    def _backoff(failures):
+        """Return the jittered backoff after the given number of failures."""
+        if not failures:
+            return 0.0
+        delay = min(BACKOFF_BASE * 2 ** min(failures - 1, 16), BACKOFF_MAX)
+        return delay * random.uniform(0.5, 1.0)
+
+
+class _RateTicket:
+    """A request waiting for the rate limiter."""
+
+    __slots__ = ("priority", "queued_at")
+
+    def __init__(self, priority) -> None:
+        """Initialize a ticket queued now."""
+        self.priority = priority
+        self.queued_at = time.monotonic()
+
+
+class _RateLimiter:
+    """Token bucket that spaces out the requests of an account.
+
+    Requests queue by priority, and a read is only let through while no
+    authentication or write request is waiting, so user actions are not held
+    up by a round of polls. The limiter only does the bookkeeping; the sync and
+    async clients sleep for the delays it returns and extend the operation
+    deadline by the time spent waiting.
+    """
+
+    def __init__(self, rate, burst) -> None:
+        """Initialize a full bucket refilled with rate tokens per second."""
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queues = tuple(
+            collections.deque() for _ in range(max(_REQUEST_PRIORITIES.values()) + 1)
+        )
+        self._max_queued = 0
+        self._requests = 0
+        self._delayed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def enqueue(self, endpoint):
+        """Queue a request of the given endpoint class and return its ticket."""
+        ticket = _RateTicket(_REQUEST_PRIORITIES[endpoint])
+        with self._lock:
+            self._queues[ticket.priority].append(ticket)
+            self._max_queued = max(
+                self._max_queued, sum(len(queue) for queue in self._queues)
+            )
+        return ticket
+
+    def try_acquire(self, ticket):
+        """Take a token for a queued request.
+
+        Returns:
+            None if the request may be sent now, else the seconds to wait
+            before trying again.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            ahead = self._position(ticket)
+            if ahead == 0 and self._tokens >= 1:
+                self._tokens -= 1
+                self._queues[ticket.priority].popleft()
+                self._record_wait(now - ticket.queued_at)
+                return None
+            # Enough tokens for this request and every request ahead of it.
+            # Requests queued later with a higher priority can push it back.
+            return max((ahead + 1 - self._tokens) / self._rate, 0.001)
+
+    def cancel(self, ticket):
+        """Drop a ticket that gave up waiting; granted tickets are ignored."""
+        with self._lock, contextlib.suppress(ValueError):
+            self._queues[ticket.priority].remove(ticket)
+
+    def stats(self):
+        """Return the queue depth and wait times of the limiter."""
+        with self._lock:
+            return {
+                "queued_writes": sum(len(queue) for queue in self._queues[:-1]),
+                "queued_reads": len(self._queues[-1]),
+                "max_queued": self._max_queued,
+                "requests": self._requests,
+                "delayed_requests": self._delayed,
+                "average_wait": (
+                    self._wait_total / self._delayed if self._delayed else 0.0
+                ),
+                "max_wait": self._wait_max,
+            }
+
+    def _position(self, ticket):
+        """Return how many queued requests go before a ticket."""
+        ahead = sum(len(queue) for queue in self._queues[: ticket.priority])
+        return ahead + self._queues[ticket.priority].index(ticket)
+
+    def _record_wait(self, waited):
+        """Count a request that was let through after waiting."""
+        self._requests += 1
+        if waited < 0.001:
+            return
+        self._delayed += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        _LOGGER.debug(
+            "Request waited %.2f seconds for the rate limit, %d still queued",
+            waited,
+            sum(len(queue) for queue in self._queues),
+        )
+
+
+def _json_loads(body):
+    """Decode a JSON response body, with orjson when it is installed.
+
+    Raises:
+        SchemaError: If the body is not valid JSON.
+
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+    except ValueError as err:
+        raise SchemaError(f"Invalid JSON response: {err}") from err
+
+
+def _redact(payload):
+    """Return a copy of a decoded payload with the secret values masked."""
+    if isinstance(payload, dict):
+        return {
+            key: (_REDACTED if str(key).lower() in REDACTED_FIELDS else _redact(value))
+            for key, value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [_redact(value) for value in payload]
+    return payload
+
+
+class _LogPayload:
+    """A request or response payload formatted only when a message needs it.
+
+    Secrets are masked and long payloads are cut off at MAX_LOGGED_PAYLOAD, so
+    payloads can be passed to debug logging and exception messages as is.
+    """
+
+    __slots__ = ("_payload",)
+
+    def __init__(self, payload) -> None:
+        """Wrap a payload: bytes, text or a decoded JSON value."""
+        self._payload = payload
+
+    def __str__(self):
+        """Return the redacted and truncated payload."""
+        payload = self._payload
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8", "replace")
+        if isinstance(payload, str):
+            text = _REDACT_PATTERN.sub(rf'\1"{_REDACTED}"', payload)
+        else:
+            text = str(_redact(payload))
+        if len(text) > MAX_LOGGED_PAYLOAD:
+            return f"{text[:MAX_LOGGED_PAYLOAD]}... ({len(text)} characters)"
+        return text
+
+
+def _field(r_json, name, key):
+    """Return a field of a response object, raising SchemaError if it is missing."""
+    try:
+        return r_json[key]
+    except (KeyError, TypeError):
+        raise SchemaError(f"{name} response is missing the {key!r} field") from None
+
+
+def _float_field(r_json, name, key):
+    """Return a numeric field of a response object as a float."""
+    value = _field(r_json, name, key)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise SchemaError(
+            f"{name} response has an invalid {key!r} field: {value!r}"
+        ) from None
+
+
+def _typed_field(r_json, name, key, kind):
+    """Return a field of a response object, checking that it has the given type."""
+    value = _field(r_json, name, key)
+    if not isinstance(value, kind):
+        raise SchemaError(f"{name} response has an invalid {key!r} field: {value!r}")
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class ThermostatState:
+    """The state of a thermostat as reported by a thermostat state response.
+
+    Snapshots are immutable: a thermostat replaces its snapshot as a whole, so
+    readers on other threads never see a half-applied refresh. Snapshots
+    compare equal when every field but last_update is equal.
+    """
+
+    connected: bool | None = None
+    setpoint_reason: str | None = None
+    current_temp: float | None = None
+    hold_mode: str | None = None
+    fan_mode: str | None = None
+    fan_state: str | None = None
+    hvac_mode: str | None = None
+    hvac_state: str | None = None
+    cool_setpoint: float | None = None
+    heat_setpoint: float | None = None
+    preset_mode: str | None = None
+    away_end_ts: str | None = None
+    last_update: float | None = field(default=None, compare=False)
+
+    @classmethod
+    def from_json(cls, r_json):
+        """Decode a thermostat state response.
+
+        Raises:
+            SchemaError: If a field is missing or has an invalid value.
+
+        """
+        name = "Thermostat state"
+        data = _typed_field(r_json, name, THERMOSTAT_DATA, dict)
+        away_details = _typed_field(r_json, name, "away_details", dict)
+        return cls(
+            connected=_field(r_json, name, "connected"),
+            setpoint_reason=_field(r_json, name, "setpoint_reason"),
+            current_temp=round(_float_field(data, name, "temperature"), 1),
+            hold_mode=_field(data, name, "hold_mode"),
+            fan_mode=_field(data, name, "fan_mode"),
+            fan_state=_field(data, name, "fan_state"),
+            hvac_mode=_field(data, name, "hvac_mode"),
+            hvac_state=_field(data, name, "hvac_state"),
+            cool_setpoint=_field(data, name, "cool_setpoint"),
+            heat_setpoint=_field(data, name, "heat_setpoint"),
+            preset_mode=PRESET_AWAY if "end_ts" in away_details else PRESET_NONE,
+            away_end_ts=away_details.get("end_ts"),
+            last_update=time.time(),
+        )
+
+    def changed_fields(self, other):
+        """Return the names of the fields that differ from another snapshot."""
+        if self == other:
+            return frozenset()
+        return frozenset(
+            state_field.name
+            for state_field in fields(self)
+            if state_field.compare
+            and getattr(self, state_field.name) != getattr(other, state_field.name)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ThermostatMetadata:
+    """The metadata of a thermostat as reported by a thermostat response."""
+
+    name: str | None = None
+    schedule_mode: str | None = None
+    min_temp: float = MIN_TEMP_DEFAULT
+    max_temp: float = MAX_TEMP_DEFAULT
+    supported_modes: tuple[str, ...] = ()
+
+    @classmethod
+    def from_json(cls, r_json):
+        """Decode a thermostat response.
+
+        Raises:
+            SchemaError: If a field is missing or has an invalid value.
+
+        """
+        name = "Thermostat"
+        model = _typed_field(r_json, name, "model", dict)
+        return cls(
+            name=_field(r_json, name, "name"),
+            schedule_mode=_field(r_json, name, "schedule_mode"),
+            min_temp=_float_field(model, name, "min_temperature"),
+            max_temp=_float_field(model, name, "max_temperature"),
+            supported_modes=tuple(_typed_field(r_json, name, "hvac_control", list)),
+        )
+
+    def to_json(self):
+        """Return the metadata in the shape of a thermostat response."""
+        return {
+            "name": self.name,
+            "schedule_mode": self.schedule_mode,
+            "model": {
+                "min_temperature": self.min_temp,
+                "max_temperature": self.max_temp,
+            },
+            "hvac_control": list(self.supported_modes),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class UserInfo:
+    """The account details of a user response."""
+
+    location_ids: tuple[int, ...]
+
+    @classmethod
+    def from_json(cls, r_json):
+        """Decode a user response.
+
+        Raises:
+            SchemaError: If the location list is missing or invalid.
+
+        """
+        return cls(tuple(_typed_field(r_json, "User", "location_id_list", list)))
+
+
+@dataclass(frozen=True, slots=True)
+class Location:
+    """The thermostats of a location response."""
+
+    thermostat_ids: tuple[int, ...]
+
+    @classmethod
+    def from_json(cls, r_json):
+        """Decode a location response.
+
+        Raises:
+            SchemaError: If the thermostat list is missing or invalid.
+
+        """
+        return cls(tuple(_typed_field(r_json, "Location", "thermostatIdList", list)))
+
+
+@dataclass(frozen=True, slots=True)
+class AwaySettings:
+    """The away setpoints of a location away settings response."""
+
+    cool_setpoint: float = MAX_TEMP_DEFAULT
+    heat_setpoint: float = MIN_TEMP_DEFAULT
+
+    @classmethod
+    def from_json(cls, r_json):
+        """Decode an away settings response.
+
+        Raises:
+            SchemaError: If a setpoint is missing or invalid.
+
+        """
+        name = "Away settings"
+        return cls(
+            cool_setpoint=_float_field(r_json, name, "cool_setpoint"),
+            heat_setpoint=_float_field(r_json, name, "heat_setpoint"),
+        )
+
+
+def _get_cached_public_key(base_url):
+    """Return the age and cached public key for an API base URL, or None if stale."""
+    with _public_key_lock:
+        cached = _public_key_cache.get(base_url)
+        if cached is None:
+            return None
+        loaded_at, public_key = cached
+        age = time.monotonic() - loaded_at
+        if age > PUBLIC_KEY_TTL:
+            del _public_key_cache[base_url]
+            return None
+        return age, public_key
+
+
+def _set_cached_public_key(base_url, public_key):
+    """Cache the public key for an API base URL."""
+    with _public_key_lock:
+        _public_key_cache[base_url] = (time.monotonic(), public_key)
 
-    def __init__(self, base_url) -> None:
-        """Initialize TheSimpleClient with the given base URL."""
+
+def _invalidate_public_key(base_url):
+    """Drop the cached public key for an API base URL."""
+    with _public_key_lock:
+        _public_key_cache.pop(base_url, None)
+
+
+class _TheSimpleClientBase:
+    """Transport-independent state and helpers shared by the API clients."""
+
+    def __init__(
+        self,
+        base_url,
+        rate=REQUEST_RATE,
+        burst=REQUEST_BURST,
+        read_reuse_window=READ_REUSE_WINDOW,
+    ) -> None:
+        """Initialize the client with the given base URL, rate limit and reuse window."""
         self._base_url = base_url
         self._token = ""
-        self._authinfo = {
-            "nonce": "",
-            "response": "",
-            "opaque": "",
-            "encryptedpass": "",
-        }
+        self._token_issued_at = None
+        self._token_lifetime = None
         self._username = ""
-        self._http_sess = None
+        self._password = None
         self._userid = ""
         self._location_id = None
+        self._location_ids = []
         self._refreshToken = ""
+        # Called without arguments after every successful token grant.
+        self.token_listener = None
         self._publicKey = None
         self._noCacheNum = random.randint(1, 200000000000)
-        self._realm = ""
-        self._nonce = ""
-        self._opaque = ""
+        self._away_settings_cache = {}
+        self._breaker = _CircuitBreaker()
+        self._limiter = _RateLimiter(rate, burst)
+        self._read_reuse_window = read_reuse_window
+        self._reads_lock = threading.Lock()
+        # In-flight authenticated GETs by URL, and finished ones as
+        # (monotonic time, result) while they may be reused.
+        self._pending_reads = {}
+        self._read_results = {}
 
     def get_location_id(self):
         """Return the current location ID."""
         return self._location_id
 
-    @property
-    def httpSess(self):
-        """Return the HTTP session, creating it if necessary."""
-        if self._http_sess is None:
-            self._http_sess = requests.Session()
-            self._http_sess.headers.update({"X-Requested-With": "XMLHttpRequest"})
+    def get_location_ids(self):
+        """Return the IDs of all locations of the account."""
+        return list(self._location_ids)
 
-        return self._http_sess
+    def retry_delay(self):
+        """Return how many seconds to wait before retrying after API failures.
 
-    def auth(self, username, password):
-        """Authenticate with TheSimple/Ecofactor API using the provided username and password.
+        The delay grows exponentially with jitter while requests keep failing
+        and covers any time the API asked to be left alone with Retry-After.
+        """
+        return self._breaker.retry_delay()
 
-        Args:
-            username: The username for authentication.
-            password: The password for authentication.
+    def rate_limit_stats(self):
+        """Return how many requests wait for the rate limit and how long they wait.
 
-        Raises:
-            AuthError: If authentication fails.
-            TheSimpleError: If unable to parse nonce response.
+        Returns:
+            A dict with the queued writes and reads, the deepest the queue
+            has been, the number of requests sent and delayed, and the
+            average and longest wait in seconds.
 
         """
-        self.getPublicKey()
-        self.getNonce()
+        return self._limiter.stats()
 
-        resp = self.buildResponse(username, password, self._realm, self._nonce)
-        encrypted_pw = self.encryptPassword(password)
+    def _get_cached_away_settings(self, location_id, max_age):
+        """Return the cached away settings of a location if fresh enough."""
+        cached = self._away_settings_cache.get(location_id)
+        if cached is None or time.monotonic() - cached[0] > max_age:
+            return None
+        return cached[1]
 
-        self.authwithdetails(username, encrypted_pw, self._nonce, resp, self._opaque)
+    def _recent_read(self, req_url):
+        """Return (time, result) of a GET still in its reuse window, or None.
 
-    def authwithdetails(self, user, encpass, nonce, resp, opaque):
-        """Authenticate with provided details and obtain an access token.
+        Must be called with _reads_lock held.
+        """
+        entry = self._read_results.get(req_url)
+        if entry is not None and time.monotonic() - entry[0] < self._read_reuse_window:
+            return entry
+        return None
+
+    def _finish_read(self, req_url, flight, result, succeeded):
+        """Stop sharing a finished GET and keep its result if it succeeded."""
+        with self._reads_lock:
+            if self._pending_reads.get(req_url) is not flight:
+                # Dropped by a write while in flight; its result may be stale.
+                return
+            del self._pending_reads[req_url]
+            if not succeeded or self._read_reuse_window <= 0:
+                return
+            now = time.monotonic()
+            self._read_results = {
+                url: entry
+                for url, entry in self._read_results.items()
+                if now - entry[0] < self._read_reuse_window
+            }
+            self._read_results[req_url] = (now, result)
+
+    def _forget_reads(self):
+        """Stop sharing and reusing GETs whose results a write may have changed."""
+        with self._reads_lock:
+            self._pending_reads.clear()
+            self._read_results.clear()
+
+    def _cache_away_settings(self, location_id, r_json):
+        """Decode and cache the away settings response of a location."""
+        settings = AwaySettings.from_json(r_json)
+        self._away_settings_cache[location_id] = (time.monotonic(), settings)
+        return settings
+
+    def _parse_user(self, r_json):
+        """Store the location IDs from a user response."""
+        self._location_ids = list(UserInfo.from_json(r_json).location_ids)
+        self._location_id = self._location_ids[0] if self._location_ids else None
+
+    def export_session(self):
+        """Return the current auth session as a JSON-serializable dict.
+
+        Returns:
+            The session dict, or None if the client is not authenticated.
+
+        """
+        if not self._token:
+            return None
+
+        issued_at = None
+        if self._token_issued_at is not None:
+            issued_at = time.time() - (time.monotonic() - self._token_issued_at)
+        return {
+            "username": self._username,
+            "access_token": self._token,
+            "refresh_token": self._refreshToken,
+            "user_id": self._userid,
+            "location_ids": list(self._location_ids),
+            "issued_at": issued_at,
+            "token_lifetime": self._token_lifetime,
+        }
+
+    def restore_session(self, session, username, password):
+        """Restore an auth session previously returned by export_session.
 
         Args:
-            user: The username.
-            encpass: The encrypted password.
-            nonce: The nonce value.
-            resp: The response hash.
-            opaque: The opaque value.
+            session: The session dict to restore.
+            username: The username the session must belong to.
+            password: The password used if the session has to be renewed.
+
+        Returns:
+            True if the session was restored, False if it does not apply.
 
         """
-        self._authinfo["nonce"] = nonce
-        self._authinfo["response"] = resp
-        self._authinfo["opaque"] = opaque
-        self._authinfo["encryptedpass"] = encpass
-        self._username = user
+        self._username = username
+        self._password = password
+
+        if not session or session.get("username") != username:
+            return False
+        try:
+            self._token = session["access_token"]
+            self._refreshToken = session["refresh_token"]
+            self._userid = session["user_id"]
+            self._location_ids = list(session["location_ids"])
+        except (KeyError, TypeError):
+            self.clearToken()
+            return False
+
+        self._location_id = self._location_ids[0] if self._location_ids else None
+        self._token_lifetime = session.get("token_lifetime")
+        self._token_issued_at = None
+        if session.get("issued_at") is not None:
+            age = max(0.0, time.time() - session["issued_at"])
+            self._token_issued_at = time.monotonic() - age
+        return True
+
+    def token_expires_in(self):
+        """Return the seconds until the access token expires, or None if unknown.
 
-        self.getToken()
+        The lifetime comes from the authenticate response when the API reports
+        one, otherwise it is learned from the age of tokens the API rejected.
+        """
+        if not self._token or self._token_issued_at is None:
+            return None
+        if self._token_lifetime is None:
+            return None
+        age = time.monotonic() - self._token_issued_at
+        return max(0.0, self._token_lifetime - age)
 
     def buildResponse(self, username, password, realm, nonce):
         """Build the response hash for digest authentication.
@@ -140,22 +973,10 @@ class TheSimpleClient:
         return hashlib.sha1((step2 + ":" + nonce).encode("utf-8")).hexdigest()
 
     def clearToken(self):
-        """Clear the current access and refresh tokens and reset the HTTP session."""
+        """Clear the current access and refresh tokens."""
         self._token = ""
         self._refreshToken = ""
-        self._http_sess = None
-
-    def createThermostat(self, thermostat_id):
-        """Create and return a TheSimpleThermostat instance for the given thermostat ID.
-
-        Args:
-            thermostat_id: The ID of the thermostat to create.
-
-        Returns:
-            TheSimpleThermostat: An instance representing the specified thermostat.
-
-        """
-        return TheSimpleThermostat(self, thermostat_id)
+        self._forget_reads()
 
     def encryptPassword(self, password):
         """Encrypt the given password using the loaded public key.
@@ -180,239 +1001,1187 @@ class TheSimpleClient:
 
         return base64.b64encode(encryptedPwBytes).decode("utf-8")
 
-    def getNonce(self):
-        """Retrieve and parse the authentication nonce from the API."""
-        url = "authenticate/nonce"
+    def _prepare_auth(self, username, password, challenge):
+        """Return the digest details answering a nonce challenge.
 
-        r = self.http_request("GET", url)
+        Args:
+            username: The username for authentication.
+            password: The password for authentication.
+            challenge: The (realm, nonce, opaque) tuple of a nonce response.
+
+        """
+        realm, nonce, opaque = challenge
+        return {
+            "username": username,
+            "nonce": nonce,
+            "response": self.buildResponse(username, password, realm, nonce),
+            "opaque": opaque,
+            "encryptedpass": self.encryptPassword(password),
+        }
+
+    def _parse_nonce(self, r_json):
+        """Parse the WWW-Authenticate challenge from a nonce response.
+
+        Returns:
+            The (realm, nonce, opaque) tuple of the challenge.
 
-        www_auth = r.json()["WWW-Authenticate"]
+        """
+        www_auth = _typed_field(r_json, "Nonce", "WWW-Authenticate", str)
 
         p = re.compile('DigestE realm="(\\w+)", nonce="(\\w+)", opaque="(\\w+)"')
         m = p.match(www_auth)
 
-        if m:
-            self._realm = m.group(1)
-            self._nonce = m.group(2)
-            self._opaque = m.group(3)
-        else:
+        if not m:
             raise TheSimpleError(f"Unable to parse nonce response: {www_auth}")
+        return m.group(1), m.group(2), m.group(3)
 
-    def getPublicKey(self):
-        """Retrieve and load the public key from the API for password encryption."""
-        url = "public_key"
-        r = self.http_request("GET", url)
-
-        pubkey_pem = r.json()["public_key"]
+    def _parse_public_key(self, r_json):
+        """Load the RSA public key from a public key response."""
+        pubkey_pem = _typed_field(r_json, "Public key", "public_key", str)
         self._publicKey = load_pem_public_key(pubkey_pem.encode("utf-8"))
+        if isinstance(self._publicKey, RSAPublicKey):
+            _set_cached_public_key(self._base_url, self._publicKey)
 
-    def getThermostatIds(self, locationIndex=0):
-        """Retrieve thermostat IDs for the specified location index.
+    def _load_cached_public_key(self):
+        """Use the cached public key if there is one, returning its age or None."""
+        cached = _get_cached_public_key(self._base_url)
+        if cached is None:
+            return None
+        age, self._publicKey = cached
+        return age
 
-        Args:
-            locationIndex: The index of the location to retrieve thermostat IDs from (default is 0).
+    def _token_request(self, authinfo):
+        """Return the URL, headers and body of the authenticate request.
 
-        Returns:
-            A list of thermostat IDs for the specified location.
+        The digest details belong to a single handshake, since the API
+        accepts a nonce only once.
 
         """
-        url = "user"
-        r = self.http_request("GET", url, None, True)
-
-        self._location_id = r.json()["location_id_list"][locationIndex]
-
-        url = f"location/{self._location_id}"
-        r = self.http_request("GET", url, None, True)
-
-        return r.json()["thermostatIdList"]
-
-    def getToken(self):
-        """Obtain an access token from TheSimple/Ecofactor API using the current authentication details."""
-        _LOGGER.debug("getToken")
-
-        self.clearToken()
-
         authstr = (
-            f'DigestE username="{self._username}", '
-            f'realm="Consumer", nonce="{self._authinfo["nonce"]}", '
-            f'response="{self._authinfo["response"]}", '
-            f'opaque="{self._authinfo["opaque"]}"'
+            f'DigestE username="{authinfo["username"]}", '
+            f'realm="Consumer", nonce="{authinfo["nonce"]}", '
+            f'response="{authinfo["response"]}", '
+            f'opaque="{authinfo["opaque"]}"'
         )
 
         url = f"{self._base_url}authenticate"
+        headers = {"Authorization": authstr}
+        body = {
+            "username": authinfo["username"],
+            "password": authinfo["encryptedpass"],
+        }
+        return url, headers, body
 
-        r = self.httpSess.post(
-            url,
-            headers={"Authorization": authstr},
-            json={
-                "username": self._username,
-                "password": self._authinfo["encryptedpass"],
-            },
-        )
-
-        _LOGGER.debug("response code: %s, response text: %s", r.status_code, r.text)
+    def _refresh_token_request(self):
+        """Return the URL, headers and body of the refresh token grant."""
+        if not self._refreshToken:
+            raise AuthError("No refresh token, authentication required")
 
-        if HTTP_SUCCESS_START <= r.status_code <= HTTP_SUCCESS_END:
-            r_json = r.json()
-            self._token = r_json["access_token"]
-            self._userid = r_json["user_id"]
-            self._refreshToken = r_json["refresh_token"]
-        elif HTTP_FORBIDDEN_START <= r.status_code <= HTTP_FORBIDDEN_END:
+        url = f"{self._base_url}{REFRESH_TOKEN_URL}"
+        body = {
+            "grant_type": "refresh_token",
+            "refresh_token": self._refreshToken,
+        }
+        return url, {}, body
+
+    def _parse_token(self, status_code, body):
+        """Store the tokens from an authenticate response or raise on failure."""
+        if HTTP_SUCCESS_START <= status_code <= HTTP_SUCCESS_END:
+            r_json = _json_loads(body)
+            self._token = _typed_field(r_json, "Token", "access_token", str)
+            self._token_issued_at = time.monotonic()
+            if r_json.get("expires_in"):
+                self._token_lifetime = float(r_json["expires_in"])
+            # A refresh grant may omit fields that did not change.
+            self._userid = r_json.get("user_id", self._userid)
+            self._refreshToken = r_json.get("refresh_token", self._refreshToken)
+            if self.token_listener is not None:
+                self.token_listener()
+        elif HTTP_FORBIDDEN_START <= status_code <= HTTP_FORBIDDEN_END:
             raise AuthError(
-                f"Authentication Error (code: {r.status_code}) (response: {r.text})"
+                f"Authentication Error (code: {status_code}) "
+                f"(response: {_LogPayload(body)})"
             )
         else:
             raise APIError(
-                f"Invalid HTTP response (code: {r.status_code}) (response: {r.text})"
+                f"Invalid HTTP response (code: {status_code}) "
+                f"(response: {_LogPayload(body)})",
+                transient=_is_transient_status(status_code),
             )
 
-    def http_request(self, method, req_url, json_req_body=None, authenticated=False):
-        """Make an HTTP request to TheSimple/Ecofactor API.
+    def _parse_refresh_token(self, status_code, body):
+        """Store the tokens from a refresh grant or raise on failure.
 
-        Args:
-            method: The HTTP method to use ("GET", "PATCH", "PUT", "DELETE").
-            req_url: The endpoint URL (relative to base URL).
-            json_req_body: Optional JSON body for the request.
-            authenticated: Whether to include authentication headers.
+        Any client error other than rate limiting means the grant is not usable,
+        whether the refresh token was rejected (401, or 400 invalid_grant) or the
+        endpoint is missing, so the refresh token is dropped. The access token is
+        kept until a new one replaces it.
 
         Raises:
-            AuthError: If authentication is required but no token is present.
-            APIError: If the HTTP response is not successful.
-
-        Returns:
-            The HTTP response object.
+            AuthError: If the refresh grant was refused.
+            APIError: If the API failed to answer it.
 
         """
-        _LOGGER.debug(
-            "HTTP request (method: %s, url: %s, json: %s, authenticated: %s)",
-            method,
-            req_url,
-            json_req_body,
-            authenticated,
-        )
+        if (
+            HTTP_CLIENT_ERROR_START <= status_code < HTTP_SERVER_ERROR_START
+            and status_code != HTTP_TOO_MANY_REQUESTS
+        ):
+            self._refreshToken = ""
+            raise AuthError(
+                f"Refresh token refused (code: {status_code}) "
+                f"(response: {_LogPayload(body)})"
+            )
+        self._parse_token(status_code, body)
+
+    def _expire_token(self):
+        """Drop a rejected access token and learn the token lifetime from its age."""
+        if self._token_issued_at is not None:
+            age = time.monotonic() - self._token_issued_at
+            if age >= MIN_TOKEN_LIFETIME and (
+                self._token_lifetime is None or age < self._token_lifetime
+            ):
+                _LOGGER.debug("Access token expired after %.0f seconds", age)
+                self._token_lifetime = age
+        # Keep the refresh token so the access token can be renewed cheaply.
+        self._token = ""
+
+    def _request_headers(self, method, req_url, json_req_body, authenticated):
+        """Validate a request and return the headers it should be sent with."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "HTTP request (method: %s, url: %s, json: %s, authenticated: %s)",
+                method,
+                req_url,
+                _LogPayload(json_req_body),
+                authenticated,
+            )
         if authenticated and len(self._token) == 0:
             raise AuthError("No token, authentication required")
+        if method not in HTTP_METHODS:
+            raise APIError(f"Unsupported HTTP method: {method}")
 
-        url = self._base_url + req_url
+        reqheaders = {}
+        if authenticated:
+            reqheaders["Authorization"] = "Bearer " + self._token
+        return reqheaders
+
+    def _check_response(self, status_code, body, token=None):
+        """Raise the matching exception for an unsuccessful HTTP status.
+
+        token is the access token the request was sent with, if any.
+        """
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "HTTP Response (status code: %s, response: %s)",
+                status_code,
+                _LogPayload(body),
+            )
+
+        if HTTP_SUCCESS_START <= status_code <= HTTP_SUCCESS_END:
+            return
+        if HTTP_FORBIDDEN_START <= status_code <= HTTP_FORBIDDEN_END:
+            if token and token == self._token:
+                self._expire_token()
+            raise AuthError(
+                f"HTTP response forbidden (code: {status_code}) "
+                f"(response: {_LogPayload(body)})"
+            )
+        raise APIError(
+            f"Invalid HTTP response (code: {status_code}) "
+            f"(response: {_LogPayload(body)})",
+            transient=_is_transient_status(status_code),
+        )
+
+
+class TheSimpleClient(_TheSimpleClientBase):
+    """Client for interacting with TheSimple/Ecofactor API."""
+
+    def __init__(
+        self,
+        base_url,
+        rate=REQUEST_RATE,
+        burst=REQUEST_BURST,
+        read_reuse_window=READ_REUSE_WINDOW,
+    ) -> None:
+        """Initialize TheSimpleClient with the given base URL.
+
+        Args:
+            base_url: The base URL of the API.
+            rate: Average number of requests per second sent to the API.
+            burst: Number of requests that may be sent at once after a pause.
+            read_reuse_window: Seconds the result of an authenticated GET is
+                reused for the same URL; 0 only shares in-flight requests.
+
+        """
+        super().__init__(base_url, rate, burst, read_reuse_window)
+        self._http_sess = None
+        self._reauth_lock = threading.Lock()
+
+    @property
+    def httpSess(self):
+        """Return the HTTP session, creating it if necessary."""
+        if self._http_sess is None:
+            self._http_sess = requests.Session()
+            self._http_sess.headers.update({"X-Requested-With": "XMLHttpRequest"})
+
+        return self._http_sess
+
+    @_with_deadline(AUTH_DEADLINE)
+    def auth(self, username, password):
+        """Authenticate with TheSimple/Ecofactor API using the provided username and password.
+
+        Args:
+            username: The username for authentication.
+            password: The password for authentication.
+
+        Raises:
+            AuthError: If authentication fails.
+            TheSimpleError: If unable to parse nonce response.
+
+        """
+        self._username = username
+        self._password = password
+        key_age = self._load_cached_public_key()
+
+        if key_age is not None:
+            challenge = self.getNonce()
+        else:
+            challenge = self._getKeyAndNonce()
+
+        try:
+            self.getToken(self._prepare_auth(username, password, challenge))
+        except AuthError:
+            # The key may have been rotated since it was cached, but a key
+            # fetched moments ago points at the credentials instead.
+            if key_age is None or key_age < PUBLIC_KEY_RETRY_AGE:
+                raise
+            _LOGGER.debug("Authentication with cached public key failed, retrying")
+            _invalidate_public_key(self._base_url)
+            self.auth(username, password)
+
+    def authwithdetails(self, user, encpass, nonce, resp, opaque):
+        """Authenticate with provided details and obtain an access token.
+
+        Args:
+            user: The username.
+            encpass: The encrypted password.
+            nonce: The nonce value.
+            resp: The response hash.
+            opaque: The opaque value.
+
+        """
+        self._username = user
+        self.getToken(
+            {
+                "username": user,
+                "nonce": nonce,
+                "response": resp,
+                "opaque": opaque,
+                "encryptedpass": encpass,
+            }
+        )
+
+    def clearToken(self):
+        """Clear the current access and refresh tokens and reset the HTTP session."""
+        super().clearToken()
+        self._http_sess = None
+
+    def createThermostat(self, thermostat_id, location_id=None):
+        """Create and return a TheSimpleThermostat instance for the given thermostat ID.
+
+        Args:
+            thermostat_id: The ID of the thermostat to create.
+            location_id: The ID of the location the thermostat belongs to
+                (default is the first location of the account).
+
+        Returns:
+            TheSimpleThermostat: An instance representing the specified thermostat,
+            with its metadata and state loaded.
+
+        """
+        thermostat = TheSimpleThermostat(self, thermostat_id, location_id)
+        thermostat.load()
+        return thermostat
+
+    def loadThermostats(self, thermostats, max_workers=MAX_WORKERS):
+        """Load the metadata and state of many thermostats in parallel.
+
+        Args:
+            thermostats: The TheSimpleThermostat instances to load.
+            max_workers: The maximum number of thermostats loaded at once.
+
+        """
+        thermostats = list(thermostats)
+        if not thermostats:
+            return
+
+        workers = max(1, min(len(thermostats), max_workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume the results so the first failure is raised here.
+            list(executor.map(lambda thermostat: thermostat.load(), thermostats))
+
+    def getNonce(self):
+        """Retrieve and parse the authentication nonce from the API.
+
+        Returns:
+            The (realm, nonce, opaque) tuple of the challenge.
+
+        """
+        url = "authenticate/nonce"
+
+        r = self.http_request("GET", url)
+
+        return self._parse_nonce(_json_loads(r.content))
+
+    def getPublicKey(self):
+        """Retrieve and load the public key from the API for password encryption."""
+        url = "public_key"
+        r = self.http_request("GET", url)
+
+        self._parse_public_key(_json_loads(r.content))
+
+    def _getKeyAndNonce(self):
+        """Fetch the public key and the nonce concurrently, returning the challenge."""
+        # Create the session up front so both threads share it.
+        _ = self.httpSess
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            key_future = executor.submit(
+                contextvars.copy_context().run, self.getPublicKey
+            )
+            challenge = self.getNonce()
+            key_future.result()
+        return challenge
+
+    def getThermostatIds(self, locationIndex=0):
+        """Retrieve thermostat IDs for the specified location index.
+
+        Args:
+            locationIndex: The index of the location to retrieve thermostat IDs from (default is 0).
+
+        Returns:
+            A list of thermostat IDs for the specified location.
+
+        """
+        location_id = self.getLocationIds()[locationIndex]
+        self._location_id = location_id
+
+        url = f"location/{location_id}"
+        r = self.http_request("GET", url, None, True)
+
+        return list(Location.from_json(_json_loads(r.content)).thermostat_ids)
+
+    def getAwaySettings(self, location_id, max_age=AWAY_SETTINGS_TTL):
+        """Retrieve the away settings of a location, reusing recent results.
+
+        Args:
+            location_id: The ID of the location.
+            max_age: The age in seconds up to which cached settings are reused.
+
+        Returns:
+            The AwaySettings of the location.
+
+        """
+        settings = self._get_cached_away_settings(location_id, max_age)
+        if settings is None:
+            url = f"location/{location_id}/away_settings"
+            r = self.http_request("GET", url, None, True)
+            settings = self._cache_away_settings(location_id, _json_loads(r.content))
+        return settings
+
+    def getLocationIds(self):
+        """Retrieve the IDs of all locations of the account.
+
+        Returns:
+            A list of location IDs.
+
+        """
+        r = self.http_request("GET", "user", None, True)
+
+        self._parse_user(_json_loads(r.content))
+        return self.get_location_ids()
+
+    def getThermostatLocations(self):
+        """Retrieve the thermostats of every location of the account.
+
+        The thermostat lists of the locations are fetched in parallel.
+
+        Returns:
+            A dict mapping each thermostat ID to the ID of its location.
+
+        """
+        location_ids = self.getLocationIds()
+        if not location_ids:
+            return {}
+
+        def fetch(location_id):
+            r = self.http_request("GET", f"location/{location_id}", None, True)
+            return Location.from_json(_json_loads(r.content)).thermostat_ids
+
+        workers = min(len(location_ids), MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            id_lists = list(
+                executor.map(
+                    lambda location_id: contextvars.copy_context().run(
+                        fetch, location_id
+                    ),
+                    location_ids,
+                )
+            )
+
+        return {
+            thermostat_id: location_id
+            for location_id, thermostat_ids in zip(location_ids, id_lists, strict=True)
+            for thermostat_id in thermostat_ids
+        }
+
+    def getToken(self, authinfo):
+        """Obtain an access token from TheSimple/Ecofactor API.
+
+        The current tokens stay in use until the new ones are received.
+
+        Args:
+            authinfo: The digest details of one handshake, used only once.
+
+        """
+        _LOGGER.debug("getToken")
+
+        url, headers, body = self._token_request(authinfo)
+
+        r = self._send("POST", url, body, headers, ENDPOINT_AUTH)
+
+        _LOGGER.debug(
+            "response code: %s, response text: %s",
+            r.status_code,
+            _LogPayload(r.content),
+        )
+
+        self._parse_token(r.status_code, r.content)
+
+    @_with_deadline(AUTH_DEADLINE)
+    def refreshAccessToken(self):
+        """Obtain a new access token using the refresh token grant.
+
+        Raises:
+            AuthError: If there is no refresh token or it was refused.
+            APIError: If the API failed to answer the request.
+
+        """
+        _LOGGER.debug("refreshAccessToken")
+
+        url, headers, body = self._refresh_token_request()
+
+        r = self._send("POST", url, body, headers, ENDPOINT_AUTH)
+
+        _LOGGER.debug(
+            "response code: %s, response text: %s",
+            r.status_code,
+            _LogPayload(r.content),
+        )
+
+        self._parse_refresh_token(r.status_code, r.content)
+
+    def renewToken(self):
+        """Renew the access token, preferring the refresh token over a full handshake.
+
+        The full handshake (public key, nonce and authenticate) only runs when
+        the refresh token is missing or refused. Server errors, timeouts and an
+        open circuit are raised as they are, keeping the refresh token.
+        Callers renewing at the same time, including requests whose token was
+        rejected, share a single renewal.
+
+        Raises:
+            AuthError: If the credentials are rejected or were never provided.
+            APIError: If the API failed to answer the refresh grant.
+
+        """
+        token = self._token
+        with self._reauth_lock:
+            if self._token and self._token != token:
+                # Another thread renewed the token while this one waited.
+                return
+            self._renew_token()
+
+    @_with_deadline(AUTH_DEADLINE)
+    def _renew_token(self):
+        """Renew the access token; the caller holds the renewal lock."""
+        if self._refreshToken:
+            try:
+                self.refreshAccessToken()
+            except AuthError as err:
+                _LOGGER.debug("Refresh token refused, re-authenticating: %s", err)
+            else:
+                return
+
+        if self._password is None:
+            raise AuthError("No credentials available, authentication required")
+        self.auth(self._username, self._password)
+
+    def http_request(self, method, req_url, json_req_body=None, authenticated=False):
+        """Make an HTTP request to TheSimple/Ecofactor API.
+
+        Args:
+            method: The HTTP method to use ("GET", "PATCH", "PUT", "DELETE").
+            req_url: The endpoint URL (relative to base URL).
+            json_req_body: Optional JSON body for the request.
+            authenticated: Whether to include authentication headers.
+
+        A request whose access token is missing or rejected is sent again
+        once after the token is renewed. Overlapping authenticated GETs of the
+        same URL share a single request, and its result is reused for
+        read_reuse_window seconds; other requests discard reused results.
+
+        Raises:
+            AuthError: If the token is rejected and cannot be renewed.
+            APITimeoutError: If the request or its operation runs out of time.
+            APIError: If the HTTP response is not successful.
+
+        Returns:
+            The HTTP response object.
+
+        """
+        if method == "GET" and authenticated:
+            return self._shared_read(req_url)
+        try:
+            return self._reauthorized_request(
+                method, req_url, json_req_body, authenticated
+            )
+        finally:
+            if method != "GET":
+                self._forget_reads()
+
+    def _reauthorized_request(self, method, req_url, json_req_body, authenticated):
+        """Send a request, renewing the token and replaying it once if rejected."""
+        token = self._token
+        try:
+            return self._request(method, req_url, json_req_body, authenticated)
+        except AuthError:
+            if not authenticated:
+                raise
+            self._reauthenticate(token)
+        return self._request(method, req_url, json_req_body, authenticated)
+
+    def _shared_read(self, req_url):
+        """Send an authenticated GET unless an identical one is in flight or recent."""
+        with self._reads_lock:
+            if (recent := self._recent_read(req_url)) is not None:
+                return recent[1]
+            flight = self._pending_reads.get(req_url)
+            if flight is None:
+                flight = self._pending_reads[req_url] = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            # Bounded by the deadline of the thread sending the request.
+            return flight.result()
+
+        try:
+            result = self._reauthorized_request("GET", req_url, None, True)
+        except BaseException as err:
+            flight.set_exception(err)
+            self._finish_read(req_url, flight, None, False)
+            raise
+        flight.set_result(result)
+        self._finish_read(req_url, flight, result, True)
+        return result
+
+    def _request(self, method, req_url, json_req_body, authenticated):
+        """Send a request once and return the checked response."""
+        reqheaders = self._request_headers(
+            method, req_url, json_req_body, authenticated
+        )
+
+        url = self._base_url + req_url
+
+        token = self._token if authenticated else None
+        r = self._send(
+            method, url, json_req_body, reqheaders, _endpoint(method, authenticated)
+        )
+
+        self._check_response(r.status_code, r.content, token)
+        return r
+
+    def _reauthenticate(self, rejected_token):
+        """Renew a rejected access token, once for all threads that saw it rejected."""
+        with self._reauth_lock:
+            if self._token and self._token != rejected_token:
+                # Another thread renewed the token while this one waited.
+                return
+            _LOGGER.debug("Access token rejected, renewing it")
+            self._renew_token()
+
+    def _send(self, method, url, json_req_body, headers, endpoint):
+        """Send a request with the timeouts of its endpoint class."""
+        self._throttle(endpoint)
+        connect, read, _total = _request_timeout(endpoint)
+        self._breaker.before_request()
+        try:
+            r = self.httpSess.request(
+                method,
+                url,
+                json=json_req_body,
+                headers=headers,
+                timeout=(connect, read),
+            )
+        except requests.Timeout as err:
+            self._breaker.record_failure()
+            raise APITimeoutError(
+                f"HTTP request timed out ({method} {url}): {err}"
+            ) from err
+        except requests.RequestException as err:
+            self._breaker.record_failure()
+            raise APIError(
+                f"HTTP request failed ({method} {url}): {err}", transient=True
+            ) from err
+        self._breaker.record_response(r.status_code, r.headers.get("Retry-After"))
+        return r
+
+    def _throttle(self, endpoint):
+        """Block until the rate limiter lets a request of the endpoint class through.
+
+        The wait is added to the operation deadline, which only bounds the API.
+        """
+        ticket = self._limiter.enqueue(endpoint)
+        try:
+            while (delay := self._limiter.try_acquire(ticket)) is not None:
+                time.sleep(delay)
+        finally:
+            self._limiter.cancel(ticket)
+        _extend_deadline(time.monotonic() - ticket.queued_at)
+
+
+class AsyncTheSimpleClient(_TheSimpleClientBase):
+    """Asyncio client for interacting with TheSimple/Ecofactor API.
+
+    Mirrors TheSimpleClient but runs every request on a shared
+    aiohttp.ClientSession, so callers can await it from the event loop.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        session: aiohttp.ClientSession,
+        rate=REQUEST_RATE,
+        burst=REQUEST_BURST,
+        read_reuse_window=READ_REUSE_WINDOW,
+    ) -> None:
+        """Initialize AsyncTheSimpleClient with the given base URL and session.
+
+        Args:
+            base_url: The base URL of the API.
+            session: The aiohttp session used for all requests. It is not
+                closed by the client.
+            rate: Average number of requests per second sent to the API.
+            burst: Number of requests that may be sent at once after a pause.
+            read_reuse_window: Seconds the result of an authenticated GET is
+                reused for the same URL; 0 only shares in-flight requests.
+
+        """
+        super().__init__(base_url, rate, burst, read_reuse_window)
+        self._session = session
+        self._reauth = None
+
+    @_with_deadline(AUTH_DEADLINE)
+    async def auth(self, username, password):
+        """Authenticate with TheSimple/Ecofactor API using the provided username and password.
+
+        Args:
+            username: The username for authentication.
+            password: The password for authentication.
+
+        Raises:
+            AuthError: If authentication fails.
+            TheSimpleError: If unable to parse nonce response.
+
+        """
+        self._username = username
+        self._password = password
+        key_age = self._load_cached_public_key()
+
+        if key_age is not None:
+            challenge = await self.getNonce()
+        else:
+            _, challenge = await asyncio.gather(self.getPublicKey(), self.getNonce())
+
+        try:
+            await self.getToken(self._prepare_auth(username, password, challenge))
+        except AuthError:
+            # The key may have been rotated since it was cached, but a key
+            # fetched moments ago points at the credentials instead.
+            if key_age is None or key_age < PUBLIC_KEY_RETRY_AGE:
+                raise
+            _LOGGER.debug("Authentication with cached public key failed, retrying")
+            _invalidate_public_key(self._base_url)
+            await self.auth(username, password)
+
+    async def authwithdetails(self, user, encpass, nonce, resp, opaque):
+        """Authenticate with provided details and obtain an access token.
+
+        Args:
+            user: The username.
+            encpass: The encrypted password.
+            nonce: The nonce value.
+            resp: The response hash.
+            opaque: The opaque value.
+
+        """
+        self._username = user
+        await self.getToken(
+            {
+                "username": user,
+                "nonce": nonce,
+                "response": resp,
+                "opaque": opaque,
+                "encryptedpass": encpass,
+            }
+        )
+
+    async def createThermostat(self, thermostat_id, location_id=None):
+        """Create, load and return an AsyncTheSimpleThermostat for the given thermostat ID.
+
+        Args:
+            thermostat_id: The ID of the thermostat to create.
+            location_id: The ID of the location the thermostat belongs to
+                (default is the first location of the account).
+
+        Returns:
+            AsyncTheSimpleThermostat: An instance representing the specified thermostat.
+
+        """
+        thermostat = AsyncTheSimpleThermostat(self, thermostat_id, location_id)
+        await thermostat.load()
+        return thermostat
+
+    async def loadThermostats(self, thermostats, max_concurrency=MAX_WORKERS):
+        """Load the metadata and state of many thermostats concurrently.
+
+        Args:
+            thermostats: The AsyncTheSimpleThermostat instances to load.
+            max_concurrency: The maximum number of thermostats loaded at once.
+
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def load(thermostat):
+            async with semaphore:
+                await thermostat.load()
+
+        await asyncio.gather(*(load(thermostat) for thermostat in thermostats))
+
+    async def getNonce(self):
+        """Retrieve and parse the authentication nonce from the API.
+
+        Returns:
+            The (realm, nonce, opaque) tuple of the challenge.
+
+        """
+        r_json = await self.http_request("GET", "authenticate/nonce")
+
+        return self._parse_nonce(r_json)
+
+    async def getPublicKey(self):
+        """Retrieve and load the public key from the API for password encryption."""
+        r_json = await self.http_request("GET", "public_key")
+
+        self._parse_public_key(r_json)
+
+    async def getThermostatIds(self, locationIndex=0):
+        """Retrieve thermostat IDs for the specified location index.
+
+        Args:
+            locationIndex: The index of the location to retrieve thermostat IDs from (default is 0).
+
+        Returns:
+            A list of thermostat IDs for the specified location.
+
+        """
+        location_id = (await self.getLocationIds())[locationIndex]
+        self._location_id = location_id
+
+        r_json = await self.http_request("GET", f"location/{location_id}", None, True)
+
+        return list(Location.from_json(r_json).thermostat_ids)
+
+    async def getAwaySettings(self, location_id, max_age=AWAY_SETTINGS_TTL):
+        """Retrieve the away settings of a location, reusing recent results.
+
+        Args:
+            location_id: The ID of the location.
+            max_age: The age in seconds up to which cached settings are reused.
+
+        Returns:
+            The AwaySettings of the location.
+
+        """
+        settings = self._get_cached_away_settings(location_id, max_age)
+        if settings is None:
+            url = f"location/{location_id}/away_settings"
+            settings = self._cache_away_settings(
+                location_id, await self.http_request("GET", url, None, True)
+            )
+        return settings
+
+    async def getLocationIds(self):
+        """Retrieve the IDs of all locations of the account.
+
+        Returns:
+            A list of location IDs.
+
+        """
+        self._parse_user(await self.http_request("GET", "user", None, True))
+        return self.get_location_ids()
+
+    async def getThermostatLocations(self):
+        """Retrieve the thermostats of every location of the account.
+
+        The thermostat lists of the locations are fetched concurrently.
+
+        Returns:
+            A dict mapping each thermostat ID to the ID of its location.
+
+        """
+        location_ids = await self.getLocationIds()
+        responses = await asyncio.gather(
+            *(
+                self.http_request("GET", f"location/{location_id}", None, True)
+                for location_id in location_ids
+            )
+        )
+
+        return {
+            thermostat_id: location_id
+            for location_id, r_json in zip(location_ids, responses, strict=True)
+            for thermostat_id in Location.from_json(r_json).thermostat_ids
+        }
+
+    async def getToken(self, authinfo):
+        """Obtain an access token from TheSimple/Ecofactor API.
+
+        The current tokens stay in use until the new ones are received.
+
+        Args:
+            authinfo: The digest details of one handshake, used only once.
+
+        """
+        _LOGGER.debug("getToken")
+
+        url, headers, body = self._token_request(authinfo)
+        status, r_body = await self._send("POST", url, body, headers, ENDPOINT_AUTH)
+
+        _LOGGER.debug(
+            "response code: %s, response text: %s", status, _LogPayload(r_body)
+        )
+
+        self._parse_token(status, r_body)
+
+    @_with_deadline(AUTH_DEADLINE)
+    async def refreshAccessToken(self):
+        """Obtain a new access token using the refresh token grant.
+
+        Raises:
+            AuthError: If there is no refresh token or it was refused.
+            APIError: If the API failed to answer the request.
+
+        """
+        _LOGGER.debug("refreshAccessToken")
+
+        url, headers, body = self._refresh_token_request()
+        status, r_body = await self._send("POST", url, body, headers, ENDPOINT_AUTH)
+
+        _LOGGER.debug(
+            "response code: %s, response text: %s", status, _LogPayload(r_body)
+        )
+
+        self._parse_refresh_token(status, r_body)
+
+    async def renewToken(self):
+        """Renew the access token, preferring the refresh token over a full handshake.
+
+        The full handshake (public key, nonce and authenticate) only runs when
+        the refresh token is missing or refused. Server errors, timeouts and an
+        open circuit are raised as they are, keeping the refresh token.
+        Callers renewing at the same time, including requests whose token was
+        rejected, share a single renewal.
+
+        Raises:
+            AuthError: If the credentials are rejected or were never provided.
+            APIError: If the API failed to answer the refresh grant.
+
+        """
+        if self._reauth is None:
+            # Run in a fresh context so the renewal gets its own deadline
+            # rather than the one of the caller that happened to start it.
+            self._reauth = asyncio.get_running_loop().create_task(
+                self._renew_token(), context=contextvars.Context()
+            )
+            self._reauth.add_done_callback(self._reauth_done)
+        await asyncio.shield(self._reauth)
+
+    @_with_deadline(AUTH_DEADLINE)
+    async def _renew_token(self):
+        """Renew the access token; run only as the shared renewal task."""
+        if self._refreshToken:
+            try:
+                await self.refreshAccessToken()
+            except AuthError as err:
+                _LOGGER.debug("Refresh token refused, re-authenticating: %s", err)
+            else:
+                return
+
+        if self._password is None:
+            raise AuthError("No credentials available, authentication required")
+        await self.auth(self._username, self._password)
+
+    async def http_request(
+        self, method, req_url, json_req_body=None, authenticated=False
+    ):
+        """Make an HTTP request to TheSimple/Ecofactor API.
+
+        Args:
+            method: The HTTP method to use ("GET", "PATCH", "PUT", "DELETE").
+            req_url: The endpoint URL (relative to base URL).
+            json_req_body: Optional JSON body for the request.
+            authenticated: Whether to include authentication headers.
 
-        reqheaders = {}
-        if authenticated:
-            reqheaders["Authorization"] = "Bearer " + self._token
+        A request whose access token is missing or rejected is sent again
+        once after the token is renewed. Overlapping authenticated GETs of the
+        same URL share a single request, and its result is reused for
+        read_reuse_window seconds; other requests discard reused results.
 
-        if method == "GET":
-            r = self.httpSess.get(url, json=json_req_body, headers=reqheaders)
-        elif method == "PATCH":
-            r = self.httpSess.patch(url, json=json_req_body, headers=reqheaders)
-        elif method == "PUT":
-            r = self.httpSess.put(url, json=json_req_body, headers=reqheaders)
-        elif method == "DELETE":
-            r = self.httpSess.delete(url, json=json_req_body, headers=reqheaders)
-        else:
-            raise APIError(f"Unsupported HTTP method: {method}")
+        Raises:
+            AuthError: If the token is rejected and cannot be renewed.
+            APITimeoutError: If the request or its operation runs out of time.
+            APIError: If the HTTP response is not successful.
 
-        _LOGGER.debug(
-            "HTTP Response (status code: %s, response: %s)", r.status_code, r.text
-        )
+        Returns:
+            The decoded JSON response body, or None if the body is empty.
 
-        if HTTP_SUCCESS_START <= r.status_code <= HTTP_SUCCESS_END:
-            return r
-        if HTTP_FORBIDDEN_START <= r.status_code <= HTTP_FORBIDDEN_END:
-            self.clearToken()
-            raise APIError(
-                f"HTTP response forbidden (code: {r.status_code}) (response: {r.text})"
+        """
+        if method == "GET" and authenticated:
+            return await self._shared_read(req_url)
+        try:
+            return await self._reauthorized_request(
+                method, req_url, json_req_body, authenticated
             )
-        raise APIError(
-            f"Invalid HTTP response (code: {r.status_code}) (response: {r.text})"
+        finally:
+            if method != "GET":
+                self._forget_reads()
+
+    async def _reauthorized_request(
+        self, method, req_url, json_req_body, authenticated
+    ):
+        """Send a request, renewing the token and replaying it once if rejected."""
+        token = self._token
+        try:
+            return await self._request(method, req_url, json_req_body, authenticated)
+        except AuthError:
+            if not authenticated:
+                raise
+            await self._reauthenticate(token)
+        return await self._request(method, req_url, json_req_body, authenticated)
+
+    async def _shared_read(self, req_url):
+        """Send an authenticated GET unless an identical one is in flight or recent.
+
+        The request runs as a task with the deadline of the caller that started
+        it, so it keeps going for the others if that caller is cancelled, and
+        every caller waits for it as long as that deadline allows.
+        """
+        with self._reads_lock:
+            if (recent := self._recent_read(req_url)) is not None:
+                return recent[1]
+            flight = self._pending_reads.get(req_url)
+            if flight is None:
+                flight = asyncio.get_running_loop().create_task(
+                    self._reauthorized_request("GET", req_url, None, True)
+                )
+                flight.add_done_callback(functools.partial(self._read_done, req_url))
+                self._pending_reads[req_url] = flight
+
+        return await asyncio.shield(flight)
+
+    def _read_done(self, req_url, task):
+        """Stop sharing a finished GET task and keep its result if it succeeded."""
+        if task.cancelled() or task.exception() is not None:
+            self._finish_read(req_url, task, None, False)
+        else:
+            self._finish_read(req_url, task, task.result(), True)
+
+    async def _reauthenticate(self, rejected_token):
+        """Renew a rejected access token, once for all requests that saw it rejected."""
+        if self._token and self._token != rejected_token:
+            # Another request already renewed the token.
+            return
+        if self._reauth is None:
+            _LOGGER.debug("Access token rejected, renewing it")
+        await self.renewToken()
+
+    def _reauth_done(self, task):
+        """Forget a finished token renewal so the next rejection starts a new one."""
+        if self._reauth is task:
+            self._reauth = None
+        if not task.cancelled():
+            # Retrieve the error even if every waiting request was cancelled.
+            task.exception()
+
+    async def _request(self, method, req_url, json_req_body, authenticated):
+        """Send a request once and return the decoded response body."""
+        reqheaders = self._request_headers(
+            method, req_url, json_req_body, authenticated
         )
 
+        url = self._base_url + req_url
 
-class TheSimpleThermostat:
-    """Represents a thermostat device managed via TheSimple/Ecofactor API."""
+        token = self._token if authenticated else None
+        status, body = await self._send(
+            method, url, json_req_body, reqheaders, _endpoint(method, authenticated)
+        )
 
-    def __init__(self, client, thermostat_id) -> None:
-        """Initialize a TheSimpleThermostat instance with the given client and thermostat ID.
+        self._check_response(status, body, token)
+        return _json_loads(body) if body else None
+
+    async def _send(self, method, url, json_req_body, headers, endpoint):
+        """Send a request on the shared session and return status and body bytes."""
+        await self._throttle(endpoint)
+        connect, read, total = _request_timeout(endpoint)
+        headers = {"X-Requested-With": "XMLHttpRequest", **headers}
+        probe = self._breaker.before_request()
+        try:
+            async with self._session.request(
+                method,
+                url,
+                json=json_req_body,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=total, sock_connect=connect, sock_read=read
+                ),
+            ) as r:
+                body = await r.read()
+        except TimeoutError as err:
+            self._breaker.record_failure()
+            raise APITimeoutError(f"HTTP request timed out ({method} {url})") from err
+        except aiohttp.ClientError as err:
+            self._breaker.record_failure()
+            raise APIError(
+                f"HTTP request failed ({method} {url}): {err}", transient=True
+            ) from err
+        except BaseException:
+            if probe:
+                self._breaker.release_probe()
+            raise
+        self._breaker.record_response(r.status, r.headers.get("Retry-After"))
+        return r.status, body
+
+    async def _throttle(self, endpoint):
+        """Wait until the rate limiter lets a request of the endpoint class through.
+
+        The wait is added to the operation deadline, which only bounds the API.
+        """
+        ticket = self._limiter.enqueue(endpoint)
+        try:
+            while (delay := self._limiter.try_acquire(ticket)) is not None:
+                await asyncio.sleep(delay)
+        finally:
+            self._limiter.cancel(ticket)
+        _extend_deadline(time.monotonic() - ticket.queued_at)
+
+
+class _TheSimpleThermostatBase:
+    """Thermostat state and request builders shared by the sync and async devices.
+
+    The state, metadata and away settings are immutable snapshots that are
+    swapped as a whole, so they can be read while another thread refreshes them.
+    """
+
+    __slots__ = (
+        "_away_settings",
+        "_client",
+        "_expected_state",
+        "_expected_until",
+        "_location_id",
+        "_metadata",
+        "_state",
+        "_thermostat_id",
+        "current_temp_deadband",
+    )
+
+    def __init__(self, client, thermostat_id, location_id=None) -> None:
+        """Initialize the thermostat state with the given client and thermostat ID.
 
         Args:
-            client: The TheSimpleClient instance used for API communication.
+            client: The client instance used for API communication.
             thermostat_id: The ID of the thermostat to manage.
+            location_id: The ID of the location the thermostat belongs to
+                (default is the first location of the account).
 
         """
         self._thermostat_id = thermostat_id
         self._client = client
-        self._fan_mode = None
-        self._fan_state = None
-        self._hvac_mode = None
-        self._hvac_state = None
-        self._hold_mode = None
-        self._cool_setpoint = None
-        self._heat_setpoint = None
-        self._setpoint_reason = None
-        self._current_temp = None
-        self._last_update = None
-        self._connected = None
-        self._name = None
-        self._max_temp = MAX_TEMP_DEFAULT
-        self._min_temp = MIN_TEMP_DEFAULT
-        self._schedule_mode = None
-        self._supported_modes = []
-        self._away_details = None
-        self._preset_mode = None
-        self._location_id = self._client.get_location_id()
-        self._away_cool_setpoint = MAX_TEMP_DEFAULT
-        self._away_heat_setpoint = MIN_TEMP_DEFAULT
-
-        self.get_metadata()
-        self.refresh()
+        self._state = ThermostatState()
+        self._metadata = ThermostatMetadata()
+        if location_id is None:
+            location_id = self._client.get_location_id()
+        self._location_id = location_id
+        self._away_settings = AwaySettings()
+        self._expected_state = {}
+        self._expected_until = None
+        self.current_temp_deadband = 0.0
 
     @property
     def client(self):
-        """Return the TheSimpleClient instance used for API communication."""
+        """Return the client instance used for API communication."""
         return self._client
 
+    @property
+    def state(self):
+        """Return the current ThermostatState snapshot."""
+        return self._state
+
     @property
     def connected(self):
         """Return whether the thermostat is currently connected."""
-        return self._connected
+        return self._state.connected
 
     @property
     def cool_setpoint(self):
         """Return the current cool setpoint temperature."""
-        return self._cool_setpoint
+        return self._state.cool_setpoint
 
     @property
     def current_temp(self):
         """Return the current temperature reported by the thermostat."""
-        return self._current_temp
+        return self._state.current_temp
 
     @property
     def preset_mode(self):
         """Return the current preset mode of the thermostat."""
-        return self._preset_mode
+        return self._state.preset_mode
 
     @property
     def fan_mode(self):
         """Return the current fan mode of the thermostat."""
-        return self._fan_mode
+        return self._state.fan_mode
 
     @property
     def fan_state(self):
         """Return the current fan state of the thermostat."""
-        return self._fan_state
+        return self._state.fan_state
 
     @property
     def heat_setpoint(self):
         """Return the current heat setpoint temperature."""
-        return self._heat_setpoint
+        return self._state.heat_setpoint
 
     @property
     def hvacMode(self):
         """Return the current HVAC mode of the thermostat."""
-        return self._hvac_mode
+        return self._state.hvac_mode
 
     @property
     def hvacState(self):
         """Return the current HVAC state of the thermostat."""
-        return self._hvac_state
+        return self._state.hvac_state
 
     @property
     def location_id(self):
@@ -422,32 +2191,32 @@ class TheSimpleThermostat:
     @property
     def last_update(self):
         """Return the timestamp of the last update from the thermostat."""
-        return self._last_update
+        return self._state.last_update
 
     @property
     def maxTemp(self):
         """Return the maximum temperature supported by the thermostat."""
-        return self._max_temp
+        return self._metadata.max_temp
 
     @property
     def minTemp(self):
         """Return the minimum temperature supported by the thermostat."""
-        return self._min_temp
+        return self._metadata.min_temp
 
     @property
     def name(self):
         """Return the name of the thermostat."""
-        return self._name
+        return self._metadata.name
 
     @property
     def setpoint_reason(self):
         """Return the reason for the current setpoint."""
-        return self._setpoint_reason
+        return self._state.setpoint_reason
 
     @property
     def supportedModes(self):
         """Return the supported HVAC modes for the thermostat."""
-        return self._supported_modes
+        return self._metadata.supported_modes
 
     @property
     def thermostat_id(self):
@@ -457,76 +2226,154 @@ class TheSimpleThermostat:
     @property
     def away_cool_setpoint(self):
         """Return the away cool setpoint temperature."""
-        return self._away_cool_setpoint
+        return self._away_settings.cool_setpoint
 
     @property
     def away_heat_setpoint(self):
         """Return the away heat setpoint temperature."""
-        return self._away_heat_setpoint
+        return self._away_settings.heat_setpoint
 
-    def get_metadata(self):
-        """Retrieve and update thermostat metadata from the API."""
-        url = f"thermostat/{self._thermostat_id}"
+    @property
+    def pending_confirmation(self):
+        """Return whether local changes have not been reported by the thermostat yet."""
+        return bool(self._expected_state)
 
-        r = self._client.http_request("GET", url, None, True)
+    def set_local_state(
+        self, hvac_mode=None, cool_setpoint=None, heat_setpoint=None, fan_mode=None
+    ):
+        """Apply state changes locally ahead of the request that sends them.
 
-        r_json = r.json()
+        The changes are kept over refreshed state until the thermostat reports
+        them or OPTIMISTIC_STATE_TIMEOUT passes. Takes the arguments of set_state.
 
-        # Log the received JSON response
-        _LOGGER.debug("get_metadata: Received JSON response: %s", r_json)
+        Raises:
+            TheSimpleError: If a value is invalid or no field is given.
 
-        self._name = r_json["name"]
-        self._schedule_mode = r_json["schedule_mode"]
-        self._min_temp = float(r_json["model"]["min_temperature"])
-        self._max_temp = float(r_json["model"]["max_temperature"])
-        self._supported_modes = r_json["hvac_control"]
+        """
+        json_req = self._state_request(
+            hvac_mode, cool_setpoint, heat_setpoint, fan_mode
+        )
+        self._apply_state_request(json_req)
+        self._expect(json_req)
 
-    def get_away_settings(self):
-        """Retrieve and update the away settings for the thermostat from the API."""
-        url = f"location/{self._location_id}/away_settings"
+    def set_local_preset_mode(self, preset):
+        """Apply a preset locally ahead of the request that sends it.
 
-        r = self._client.http_request("GET", url, None, True)
+        Args:
+            preset: The preset mode to apply (PRESET_AWAY or PRESET_NONE).
 
-        r_json = r.json()
+        Raises:
+            TheSimpleError: If an invalid preset mode is provided.
 
-        self._away_cool_setpoint = float(r_json["cool_setpoint"])
-        self._away_heat_setpoint = float(r_json["heat_setpoint"])
+        """
+        if self._check_preset(preset):
+            self._state = replace(self._state, preset_mode=preset)
+            self._expect({"preset_mode": preset})
+
+    def clear_expected_state(self):
+        """Stop keeping local changes over refreshed state, e.g. after a failed write."""
+        self._expected_state = {}
+        self._expected_until = None
+
+    def _expect(self, fields):
+        """Keep the given fields until the thermostat reports them."""
+        self._expected_state = {**self._expected_state, **fields}
+        self._expected_until = time.monotonic() + OPTIMISTIC_STATE_TIMEOUT
+
+    def _reconcile_expected_state(self, state):
+        """Return a refreshed state with the unconfirmed local changes reapplied."""
+        if not self._expected_state:
+            return state
+        if time.monotonic() > self._expected_until:
+            _LOGGER.debug(
+                "Thermostat %s did not confirm %s",
+                self._thermostat_id,
+                self._expected_state,
+            )
+            self.clear_expected_state()
+            return state
+
+        pending = {}
+        for name, value in self._expected_state.items():
+            current = getattr(state, name)
+            if name == "hvac_mode" and value == "auto":
+                # The thermostat reports auto as autocool or autoheat
+                confirmed = str(current).startswith("auto")
+            else:
+                confirmed = current == value
+            if not confirmed:
+                pending[name] = value
+
+        if not pending:
+            self.clear_expected_state()
+            return state
+
+        self._expected_state = pending
+        return replace(state, **pending)
 
-    def set_fan_mode(self, fan_mode):
-        """Set the fan mode for the thermostat.
+    @property
+    def metadata(self):
+        """Return the thermostat metadata in the shape of a thermostat response."""
+        return self._metadata.to_json()
+
+    def restore_metadata(self, metadata):
+        """Apply metadata saved from the metadata property without any request.
 
         Args:
-            fan_mode: The fan mode to set (FAN_ON or FAN_AUTO).
+            metadata: The metadata to apply.
 
         Raises:
-            TheSimpleError: If an invalid fan mode is provided.
+            SchemaError: If the metadata is malformed.
 
         """
-        if fan_mode == FAN_ON:
-            set_fan_mode = "on"
-        elif fan_mode == FAN_AUTO:
-            set_fan_mode = "auto"
-        else:
-            raise TheSimpleError(f"Invalid fan mode: {fan_mode}")
-
-        url = f"thermostat/{self._thermostat_id}/state"
+        self._apply_metadata(ThermostatMetadata.from_json(metadata))
 
-        json_req = {"fan_mode": set_fan_mode}
+    def _apply_metadata(self, metadata):
+        """Update thermostat metadata from decoded ThermostatMetadata."""
+        _LOGGER.debug("get_metadata: Received %s", metadata)
 
-        self._client.http_request("PATCH", url, json_req, True)
+        self._metadata = metadata
 
-        self._fan_mode = fan_mode
+    def _apply_away_settings(self, settings):
+        """Update the away setpoints from decoded AwaySettings."""
+        self._away_settings = settings
 
-    def set_mode(self, mode):
-        """Set the HVAC mode for the thermostat.
+    def _apply_state(self, state):
+        """Update the thermostat state from a decoded ThermostatState.
 
-        Args:
-            mode: The HVAC mode to set (HVACMode.COOL, HVACMode.HEAT, HVACMode.AUTO, HVACMode.OFF).
+        Changes of the current temperature smaller than current_temp_deadband
+        are ignored so sensor noise does not count as a change.
 
-        Raises:
-            TheSimpleError: If an invalid HVAC mode is provided.
+        Returns:
+            A frozenset with the names of the state fields that changed.
 
         """
+        _LOGGER.debug("refresh: Received %s", state)
+
+        previous = self._state
+        if (
+            previous.current_temp is not None
+            and abs(state.current_temp - previous.current_temp)
+            < self.current_temp_deadband
+        ):
+            state = replace(state, current_temp=previous.current_temp)
+
+        self._state = self._reconcile_expected_state(state)
+        return self._state.changed_fields(previous)
+
+    def _fan_mode_request(self, fan_mode):
+        """Return the state request body for a fan mode."""
+        if fan_mode == FAN_ON:
+            set_fan_mode = "on"
+        elif fan_mode == FAN_AUTO:
+            set_fan_mode = "auto"
+        else:
+            raise TheSimpleError(f"Invalid fan mode: {fan_mode}")
+
+        return {"fan_mode": set_fan_mode}
+
+    def _mode_request(self, mode):
+        """Return the state request body for an HVAC mode."""
         if mode == HVACMode.COOL:
             set_mode = "cool"
         elif mode == HVACMode.HEAT:
@@ -538,50 +2385,194 @@ class TheSimpleThermostat:
         else:
             raise TheSimpleError(f"Invalid HVAC mode: {mode}")
 
-        url = f"thermostat/{self._thermostat_id}/state"
+        return {"hvac_mode": set_mode}
 
-        json_req = {"hvac_mode": set_mode}
+    def _temp_request(self, temp, mode=None):
+        """Return the state request body for a setpoint, or None if nothing to send.
 
-        self._client.http_request("PATCH", url, json_req, True)
+        mode is the HVAC mode the setpoint is for (default is the current mode).
+        """
+        if mode is None:
+            mode = self.hvacMode
 
-    def set_temp(self, temp):
-        """Set the temperature setpoint for the thermostat.
+        if temp < self._metadata.min_temp or temp > self._metadata.max_temp:
+            return None
+
+        if mode == HVACMode.COOL:
+            return {"cool_setpoint": int(temp)}
+        if mode == HVACMode.HEAT:
+            return {"heat_setpoint": int(temp)}
+        if mode == HVACMode.OFF:
+            return None
+        raise TheSimpleError(f"set_temp: Unable to determine current HVAC Mode: {mode}")
+
+    def setpoint_fields(self, temp, hvac_mode=None):
+        """Return the set_state arguments that set the setpoint for an HVAC mode.
 
         Args:
-            temp: The target temperature to set.
+            temp: The target temperature.
+            hvac_mode: The HVAC mode the setpoint is for (default is the current mode).
+
+        Returns:
+            A dict with cool_setpoint or heat_setpoint, or None if there is
+            nothing to set (temperature out of range or mode off).
 
         Raises:
-            TheSimpleError: If the current HVAC mode is not supported for setting temperature.
+            TheSimpleError: If the HVAC mode is not supported for setting temperature.
 
         """
-        if temp < self._min_temp or temp > self._max_temp:
-            return
-
-        url = f"thermostat/{self._thermostat_id}/state"
+        return self._temp_request(temp, hvac_mode)
 
+    def _state_request(self, hvac_mode, cool_setpoint, heat_setpoint, fan_mode):
+        """Return a single state request body combining the given fields."""
         json_req = {}
+        metadata = self._metadata
+        if hvac_mode is not None:
+            json_req.update(self._mode_request(hvac_mode))
+        for name, temp in (
+            ("cool_setpoint", cool_setpoint),
+            ("heat_setpoint", heat_setpoint),
+        ):
+            if temp is None:
+                continue
+            if temp < metadata.min_temp or temp > metadata.max_temp:
+                raise TheSimpleError(
+                    f"Invalid {name}: {temp} (range: {metadata.min_temp}-{metadata.max_temp})"
+                )
+            json_req[name] = int(temp)
+        if fan_mode is not None:
+            json_req.update(self._fan_mode_request(fan_mode))
+
+        if not json_req:
+            raise TheSimpleError("set_state: No state fields given")
+        return json_req
+
+    def _apply_state_request(self, json_req):
+        """Set internal state from a sent request so we don't wait on a refresh."""
+        self._state = replace(self._state, **json_req)
+
+    def _check_preset(self, preset):
+        """Validate a preset and return False if it cannot be applied right now."""
+        if preset not in [PRESET_AWAY, PRESET_NONE]:
+            raise TheSimpleError(f"Invalid preset mode: {preset}")
 
-        if self.hvacMode == HVACMode.COOL:
-            json_req["cool_setpoint"] = int(temp)
-            self._cool_setpoint = int(temp)
-        elif self.hvacMode == HVACMode.HEAT:
-            json_req["heat_setpoint"] = int(temp)
-            self._heat_setpoint = int(temp)
-        elif self.hvacMode == HVACMode.OFF:
-            return
-        else:
-            raise TheSimpleError(
-                f"set_temp: Unable to determine current HVAC Mode: {self.hvacMode}"
+        # Check if the thermostat is off
+        if self._state.hvac_mode == "off":
+            _LOGGER.warning(
+                "Cannot set preset mode to %s because thermostat is off", preset
             )
+            self._state = replace(self._state, preset_mode=PRESET_NONE)
+            return False
+        return True
+
+    def _away_request(self):
+        """Return the away request body built from the location away settings."""
+        return {
+            "cool_setpoint": self._away_settings.cool_setpoint,
+            "heat_setpoint": self._away_settings.heat_setpoint,
+            "end_ts": "2050-12-31T00:00:00+00:00",
+        }
+
+
+class TheSimpleThermostat(_TheSimpleThermostatBase):
+    """Represents a thermostat device managed via TheSimple/Ecofactor API.
+
+    Construction does no I/O; call load(), TheSimpleClient.loadThermostats or
+    use TheSimpleClient.createThermostat to fetch metadata and state.
+    """
+
+    __slots__ = ()
+
+    @_with_deadline(REFRESH_DEADLINE)
+    def load(self):
+        """Retrieve the thermostat metadata and state from the API."""
+        self.get_metadata()
+        self.refresh()
+
+    def get_metadata(self):
+        """Retrieve and update thermostat metadata from the API."""
+        url = f"thermostat/{self._thermostat_id}"
+
+        r = self._client.http_request("GET", url, None, True)
+
+        self._apply_metadata(ThermostatMetadata.from_json(_json_loads(r.content)))
+
+    def get_away_settings(self):
+        """Retrieve and update the away settings for the thermostat from the API."""
+        self._apply_away_settings(self._client.getAwaySettings(self._location_id))
+
+    @_with_deadline(WRITE_DEADLINE)
+    def set_state(
+        self, hvac_mode=None, cool_setpoint=None, heat_setpoint=None, fan_mode=None
+    ):
+        """Set several state fields of the thermostat in a single request.
+
+        Args:
+            hvac_mode: The HVAC mode to set (HVACMode.COOL, HVACMode.HEAT, HVACMode.AUTO, HVACMode.OFF).
+            cool_setpoint: The cool setpoint to set.
+            heat_setpoint: The heat setpoint to set.
+            fan_mode: The fan mode to set (FAN_ON or FAN_AUTO).
+
+        Raises:
+            TheSimpleError: If a value is invalid or no field is given.
+
+        """
+        json_req = self._state_request(
+            hvac_mode, cool_setpoint, heat_setpoint, fan_mode
+        )
+
+        url = f"thermostat/{self._thermostat_id}/state"
 
         self._client.http_request("PATCH", url, json_req, True)
 
         # if successful, set internal state so we don't have to wait on a refresh
-        if self.hvacMode == HVACMode.COOL:
-            self._cool_setpoint = int(temp)
-        elif self.hvacMode == HVACMode.HEAT:
-            self._heat_setpoint = int(temp)
+        self._apply_state_request(json_req)
+
+    def set_fan_mode(self, fan_mode):
+        """Set the fan mode for the thermostat.
+
+        Args:
+            fan_mode: The fan mode to set (FAN_ON or FAN_AUTO).
+
+        Raises:
+            TheSimpleError: If an invalid fan mode is provided.
+
+        """
+        self.set_state(fan_mode=fan_mode)
+
+    def set_mode(self, mode):
+        """Set the HVAC mode for the thermostat.
+
+        Args:
+            mode: The HVAC mode to set (HVACMode.COOL, HVACMode.HEAT, HVACMode.AUTO, HVACMode.OFF).
+
+        Raises:
+            TheSimpleError: If an invalid HVAC mode is provided.
+
+        """
+        self.set_state(hvac_mode=mode)
+
+    def set_temp(self, temp, hvac_mode=None):
+        """Set the temperature setpoint for the thermostat.
+
+        Args:
+            temp: The target temperature to set.
+            hvac_mode: Optional HVAC mode to switch to in the same request. The
+                setpoint is then set for this mode instead of the current one.
+
+        Raises:
+            TheSimpleError: If the HVAC mode is not supported for setting temperature.
+
+        """
+        json_req = self._temp_request(temp, hvac_mode)
+        if json_req is None:
+            if hvac_mode is not None:
+                self.set_mode(hvac_mode)
+            return
+
+        self.set_state(hvac_mode=hvac_mode, **json_req)
 
+    @_with_deadline(WRITE_DEADLINE)
     def set_preset_mode(self, preset):
         """Set the preset mode for the thermostat.
 
@@ -592,60 +2583,167 @@ class TheSimpleThermostat:
             TheSimpleError: If an invalid preset mode is provided.
 
         """
-        if preset not in [PRESET_AWAY, PRESET_NONE]:
-            raise TheSimpleError(f"Invalid preset mode: {preset}")
-
-        # Check if the thermostat is off
-        if self._hvac_mode == "off":
-            _LOGGER.warning(
-                "Cannot set preset mode to %s because thermostat is off", preset
-            )
-            self._preset_mode = PRESET_NONE
+        if not self._check_preset(preset):
             return
 
         self.get_away_settings()
         url = f"thermostat/{self._thermostat_id}/away"
 
         if preset == PRESET_AWAY:
-            json_req = {
-                "cool_setpoint": self._away_cool_setpoint,
-                "heat_setpoint": self._away_heat_setpoint,
-                "end_ts": "2050-12-31T00:00:00+00:00",
-            }
-            self._client.http_request("PUT", url, json_req, True)
-            self._preset_mode = PRESET_AWAY
+            self._client.http_request("PUT", url, self._away_request(), True)
+            self._state = replace(self._state, preset_mode=PRESET_AWAY)
 
         elif preset == PRESET_NONE:
             self._client.http_request("DELETE", url, None, True)
-            self._preset_mode = PRESET_NONE
+            self._state = replace(self._state, preset_mode=PRESET_NONE)
 
+    @_with_deadline(REFRESH_DEADLINE)
     def refresh(self):
-        """Refresh the thermostat state from the API and update internal attributes."""
+        """Refresh the thermostat state from the API and update internal attributes.
+
+        Returns:
+            A frozenset with the names of the state fields that changed.
+
+        """
         url = f"thermostat/{self._thermostat_id}/state"
 
         r = self._client.http_request("GET", url, None, True)
-        r_json = r.json()
-
-        # Log the received JSON response
-        _LOGGER.debug("refresh: Received JSON response: %s", r_json)
-
-        self._connected = r_json["connected"]
-        self._setpoint_reason = r_json["setpoint_reason"]
-
-        thermostat_info = "best_known_current_state_thermostat_data"
-        self._current_temp = round(float(r_json[thermostat_info]["temperature"]), 1)
-        self._hold_mode = r_json[thermostat_info]["hold_mode"]
-        self._fan_mode = r_json[thermostat_info]["fan_mode"]
-        self._fan_state = r_json[thermostat_info]["fan_state"]
-        self._hvac_mode = r_json[thermostat_info]["hvac_mode"]
-        self._hvac_state = r_json[thermostat_info]["hvac_state"]
-        self._cool_setpoint = r_json[thermostat_info]["cool_setpoint"]
-        self._heat_setpoint = r_json[thermostat_info]["heat_setpoint"]
-        self._last_update = time.time()
-
-        if "end_ts" in r_json["away_details"]:
-            self._away_details = r_json["away_details"]["end_ts"]
-            self._preset_mode = PRESET_AWAY
-        else:
-            self._away_details = None
-            self._preset_mode = PRESET_NONE
+
+        return self._apply_state(ThermostatState.from_json(_json_loads(r.content)))
+
+
+class AsyncTheSimpleThermostat(_TheSimpleThermostatBase):
+    """Represents a thermostat device managed via the asyncio client.
+
+    Construction does no I/O; call load(), AsyncTheSimpleClient.loadThermostats
+    or use AsyncTheSimpleClient.createThermostat to fetch metadata and state.
+    """
+
+    __slots__ = ()
+
+    @_with_deadline(REFRESH_DEADLINE)
+    async def load(self):
+        """Retrieve the thermostat metadata and state from the API concurrently."""
+        await asyncio.gather(self.get_metadata(), self.refresh())
+
+    async def get_metadata(self):
+        """Retrieve and update thermostat metadata from the API."""
+        url = f"thermostat/{self._thermostat_id}"
+
+        r_json = await self._client.http_request("GET", url, None, True)
+
+        self._apply_metadata(ThermostatMetadata.from_json(r_json))
+
+    async def get_away_settings(self):
+        """Retrieve and update the away settings for the thermostat from the API."""
+        self._apply_away_settings(await self._client.getAwaySettings(self._location_id))
+
+    @_with_deadline(WRITE_DEADLINE)
+    async def set_state(
+        self, hvac_mode=None, cool_setpoint=None, heat_setpoint=None, fan_mode=None
+    ):
+        """Set several state fields of the thermostat in a single request.
+
+        Args:
+            hvac_mode: The HVAC mode to set (HVACMode.COOL, HVACMode.HEAT, HVACMode.AUTO, HVACMode.OFF).
+            cool_setpoint: The cool setpoint to set.
+            heat_setpoint: The heat setpoint to set.
+            fan_mode: The fan mode to set (FAN_ON or FAN_AUTO).
+
+        Raises:
+            TheSimpleError: If a value is invalid or no field is given.
+
+        """
+        json_req = self._state_request(
+            hvac_mode, cool_setpoint, heat_setpoint, fan_mode
+        )
+
+        url = f"thermostat/{self._thermostat_id}/state"
+
+        await self._client.http_request("PATCH", url, json_req, True)
+
+        # if successful, set internal state so we don't have to wait on a refresh
+        self._apply_state_request(json_req)
+
+    async def set_fan_mode(self, fan_mode):
+        """Set the fan mode for the thermostat.
+
+        Args:
+            fan_mode: The fan mode to set (FAN_ON or FAN_AUTO).
+
+        Raises:
+            TheSimpleError: If an invalid fan mode is provided.
+
+        """
+        await self.set_state(fan_mode=fan_mode)
+
+    async def set_mode(self, mode):
+        """Set the HVAC mode for the thermostat.
+
+        Args:
+            mode: The HVAC mode to set (HVACMode.COOL, HVACMode.HEAT, HVACMode.AUTO, HVACMode.OFF).
+
+        Raises:
+            TheSimpleError: If an invalid HVAC mode is provided.
+
+        """
+        await self.set_state(hvac_mode=mode)
+
+    async def set_temp(self, temp, hvac_mode=None):
+        """Set the temperature setpoint for the thermostat.
+
+        Args:
+            temp: The target temperature to set.
+            hvac_mode: Optional HVAC mode to switch to in the same request. The
+                setpoint is then set for this mode instead of the current one.
+
+        Raises:
+            TheSimpleError: If the HVAC mode is not supported for setting temperature.
+
+        """
+        json_req = self._temp_request(temp, hvac_mode)
+        if json_req is None:
+            if hvac_mode is not None:
+                await self.set_mode(hvac_mode)
+            return
+
+        await self.set_state(hvac_mode=hvac_mode, **json_req)
+
+    @_with_deadline(WRITE_DEADLINE)
+    async def set_preset_mode(self, preset):
+        """Set the preset mode for the thermostat.
+
+        Args:
+            preset: The preset mode to set (PRESET_AWAY or PRESET_NONE).
+
+        Raises:
+            TheSimpleError: If an invalid preset mode is provided.
+
+        """
+        if not self._check_preset(preset):
+            return
+
+        await self.get_away_settings()
+        url = f"thermostat/{self._thermostat_id}/away"
+
+        if preset == PRESET_AWAY:
+            await self._client.http_request("PUT", url, self._away_request(), True)
+            self._state = replace(self._state, preset_mode=PRESET_AWAY)
+
+        elif preset == PRESET_NONE:
+            await self._client.http_request("DELETE", url, None, True)
+            self._state = replace(self._state, preset_mode=PRESET_NONE)
+
+    @_with_deadline(REFRESH_DEADLINE)
+    async def refresh(self):
+        """Refresh the thermostat state from the API and update internal attributes.
+
+        Returns:
+            A frozenset with the names of the state fields that changed.
+
+        """
+        url = f"thermostat/{self._thermostat_id}/state"
+
+        r_json = await self._client.http_request("GET", url, None, True)
+
+        return self._apply_state(ThermostatState.from_json(r_json))
@@ -0,0 +1 @@
+"""Tests for The Simple WiFi Thermostat integration."""
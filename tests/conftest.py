@@ -0,0 +1,203 @@
+"""Fixtures for The Simple WiFi Thermostat tests."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterator
+import copy
+from functools import partial
+import json
+import time
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+import pytest
+
+from custom_components.simple import store
+from custom_components.simple.thesimple import (
+    THERMOSTAT_DATA,
+    AsyncTheSimpleClient,
+    _invalidate_public_key,
+)
+
+BASE_URL = "https://api.test/"
+ACCESS_TOKEN = "access-1"
+RENEWED_TOKEN = "access-2"
+
+PUBLIC_KEY_PEM = (
+    rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    .public_key()
+    .public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    .decode()
+)
+
+
+METADATA = {
+    "name": "Hallway",
+    "schedule_mode": "manual",
+    "model": {"min_temperature": 45.0, "max_temperature": 90.0},
+    "hvac_control": ["heat", "cool", "auto", "off"],
+}
+
+
+def state_response(**data: Any) -> dict[str, Any]:
+    """Return a thermostat state response, overriding the given data fields."""
+    return {
+        "connected": True,
+        "setpoint_reason": "schedule",
+        "away_details": {},
+        THERMOSTAT_DATA: {
+            "temperature": 70.0,
+            "hold_mode": "none",
+            "fan_mode": "auto",
+            "fan_state": "off",
+            "hvac_mode": "heat",
+            "hvac_state": "idle",
+            "cool_setpoint": 76,
+            "heat_setpoint": 68,
+            **data,
+        },
+    }
+
+
+class FakeResponse:
+    """Response of a FakeSession request."""
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Initialize a response with a JSON body."""
+        self.status = status
+        self.headers = headers or {}
+        self._body = b"" if body is None else json.dumps(body).encode()
+
+    async def read(self) -> bytes:
+        """Return the body bytes."""
+        return self._body
+
+
+Handler = Callable[[str, str, dict[str, str]], Awaitable[FakeResponse]]
+
+
+class _FakeRequest:
+    """Async context manager that answers a request from the session handler."""
+
+    def __init__(self, session: FakeSession, method: str, path: str, headers) -> None:
+        self._session = session
+        self._method = method
+        self._path = path
+        self._headers = headers
+
+    async def __aenter__(self) -> FakeResponse:
+        self._session.requests.append((self._method, self._path))
+        return await self._session.handler(self._method, self._path, self._headers)
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class FakeSession:
+    """Stand-in for the aiohttp session that records the requests it answers."""
+
+    def __init__(self, handler: Handler) -> None:
+        """Initialize the session with the coroutine that answers requests."""
+        self.handler = handler
+        self.requests: list[tuple[str, str]] = []
+
+    def request(self, method, url, json=None, headers=None, timeout=None):
+        """Start a request against the handler."""
+        return _FakeRequest(self, method, url.removeprefix(BASE_URL), headers or {})
+
+    def count(self, method: str, path: str) -> int:
+        """Return how many times a request was sent."""
+        return self.requests.count((method, path))
+
+
+def make_client(handler: Handler, **kwargs: Any) -> AsyncTheSimpleClient:
+    """Return an async client with a restored session on a FakeSession."""
+    client = AsyncTheSimpleClient(BASE_URL, FakeSession(handler), **kwargs)
+    client.restore_session(
+        {
+            "username": "user",
+            "access_token": ACCESS_TOKEN,
+            "refresh_token": "refresh",
+            "user_id": 1,
+            "location_ids": [10],
+        },
+        "user",
+        "password",
+    )
+    return client
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start the clock at an arbitrary time."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self.now += seconds
+
+
+@pytest.fixture
+def no_cached_public_key() -> Iterator[None]:
+    """Make the test fetch the public key instead of using a cached one."""
+    _invalidate_public_key(BASE_URL)
+    yield
+    _invalidate_public_key(BASE_URL)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the monotonic clock for code that does not run an event loop."""
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+class FakeStore:
+    """In-memory stand-in for the Home Assistant Store helper."""
+
+    def __init__(
+        self, files: dict[str, Any], hass, version, key, private=False
+    ) -> None:
+        """Initialize a store kept in the files dict under its key."""
+        self._files = files
+        self._key = key
+        self.private = private
+
+    async def async_load(self) -> Any:
+        """Return a copy of the stored data, or None."""
+        return copy.deepcopy(self._files.get(self._key))
+
+    async def async_save(self, data: Any) -> None:
+        """Store the data."""
+        self._files[self._key] = copy.deepcopy(data)
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float) -> None:
+        """Store the data at once instead of after the delay."""
+        self._files[self._key] = data_func()
+
+    async def async_remove(self) -> None:
+        """Remove the stored data."""
+        self._files.pop(self._key, None)
+
+
+@pytest.fixture
+def storage(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    """Keep the integration stores in memory and return their files by key."""
+    files: dict[str, Any] = {}
+    monkeypatch.setattr(store, "Store", partial(FakeStore, files))
+    return files
@@ -0,0 +1,136 @@
+"""Tests for the circuit breaker of the TheSimple/Ecofactor client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.simple.thesimple import (
+    BREAKER_THRESHOLD,
+    APIError,
+    CircuitOpenError,
+    _CircuitBreaker,
+    _parse_retry_after,
+)
+
+from .conftest import FakeClock, FakeResponse, make_client
+
+STATE_URL = "thermostat/1/state"
+
+
+def _fail(breaker: _CircuitBreaker, times: int) -> None:
+    """Record failed requests on a breaker."""
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record_failure()
+
+
+def test_breaker_opens_at_threshold(clock: FakeClock) -> None:
+    """Test requests fail fast once BREAKER_THRESHOLD requests failed in a row."""
+    breaker = _CircuitBreaker()
+
+    _fail(breaker, BREAKER_THRESHOLD - 1)
+    assert breaker.before_request() is False
+
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.before_request()
+    assert err.value.retry_after > 0
+
+
+def test_breaker_lets_one_probe_through(clock: FakeClock) -> None:
+    """Test only one request probes an open circuit and its success closes it."""
+    breaker = _CircuitBreaker()
+    _fail(breaker, BREAKER_THRESHOLD)
+
+    clock.advance(breaker.retry_delay())
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_response(200)
+    assert breaker.before_request() is False
+    assert breaker.retry_delay() == 0
+
+
+def test_breaker_failed_probe_reopens(clock: FakeClock) -> None:
+    """Test a failed probe opens the circuit again."""
+    breaker = _CircuitBreaker()
+    _fail(breaker, BREAKER_THRESHOLD)
+
+    clock.advance(breaker.retry_delay())
+    assert breaker.before_request() is True
+    breaker.record_response(503)
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_breaker_honors_retry_after(clock: FakeClock) -> None:
+    """Test a Retry-After holds requests back even below the threshold."""
+    breaker = _CircuitBreaker()
+
+    breaker.before_request()
+    breaker.record_response(429, "120")
+
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.before_request()
+    assert err.value.retry_after == pytest.approx(120)
+
+    clock.advance(119)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    clock.advance(1)
+    assert breaker.before_request() is True
+
+
+def test_parse_retry_after() -> None:
+    """Test Retry-After values in seconds, as a date and malformed."""
+    assert _parse_retry_after("30") == 30
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert _parse_retry_after("soon") is None
+    assert _parse_retry_after(None) is None
+
+
+def test_client_backs_off_after_retry_after() -> None:
+    """Test the client does not send requests while the API asked to wait."""
+
+    async def handler(method, path, headers):
+        return FakeResponse(503, {"error": "busy"}, {"Retry-After": "60"})
+
+    async def run() -> None:
+        client = make_client(handler)
+        session = client._session
+
+        with pytest.raises(APIError) as err:
+            await client.http_request("GET", STATE_URL, None, True)
+        assert not isinstance(err.value, CircuitOpenError)
+
+        with pytest.raises(CircuitOpenError):
+            await client.http_request("GET", "thermostat/2/state", None, True)
+        assert len(session.requests) == 1
+        assert client.retry_delay() == pytest.approx(60, abs=1)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    ("status", "transient"),
+    [(400, False), (404, False), (429, True), (500, True), (503, True)],
+)
+def test_client_marks_transient_errors(status: int, transient: bool) -> None:
+    """Test the errors the breaker counts are the ones marked transient."""
+
+    async def handler(method, path, headers):
+        return FakeResponse(status, {"error": "failed"})
+
+    async def run() -> None:
+        client = make_client(handler)
+
+        with pytest.raises(APIError) as err:
+            await client.http_request("GET", STATE_URL, None, True)
+        assert err.value.transient is transient
+        assert (client._breaker._failures == 1) is transient
+
+    asyncio.run(run())
@@ -0,0 +1,129 @@
+"""Tests for the per-thermostat command queue."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.simple.commands import ThermostatCommandQueue
+from custom_components.simple.thesimple import APIError
+
+
+class FakeThermostat:
+    """Thermostat that records the writes it receives."""
+
+    thermostat_id = 1
+
+    def __init__(self, error: Exception | None = None) -> None:
+        """Initialize the thermostat, optionally failing its state writes."""
+        self.error = error
+        self.calls: list[tuple[str, Any]] = []
+
+    async def set_state(self, **fields: Any) -> None:
+        """Record a state write."""
+        self.calls.append(("state", fields))
+        if self.error is not None:
+            raise self.error
+
+    async def set_preset_mode(self, preset: str) -> None:
+        """Record a preset change."""
+        self.calls.append(("preset", preset))
+
+
+def _queue(thermostat: FakeThermostat) -> ThermostatCommandQueue:
+    """Return a queue without a coalescing delay on the running loop."""
+    loop = asyncio.get_running_loop()
+    entry = SimpleNamespace(
+        async_create_background_task=lambda hass, target, name: loop.create_task(target)
+    )
+    return ThermostatCommandQueue(
+        SimpleNamespace(loop=loop), entry, thermostat, window=0
+    )
+
+
+def test_state_writes_coalesce_latest_wins() -> None:
+    """Test rapid state writes are sent as one request with the latest values."""
+    thermostat = FakeThermostat()
+
+    async def run() -> None:
+        queue = _queue(thermostat)
+        await asyncio.gather(
+            queue.async_set_state(hvac_mode="heat"),
+            queue.async_set_state(heat_setpoint=68),
+            queue.async_set_state(heat_setpoint=70),
+        )
+
+    asyncio.run(run())
+
+    assert thermostat.calls == [("state", {"hvac_mode": "heat", "heat_setpoint": 70})]
+
+
+def test_commands_of_different_kinds_keep_their_order() -> None:
+    """Test a preset change is not merged across state writes."""
+    thermostat = FakeThermostat()
+
+    async def run() -> None:
+        queue = _queue(thermostat)
+        await asyncio.gather(
+            queue.async_set_state(hvac_mode="cool"),
+            queue.async_set_preset_mode("away"),
+            queue.async_set_state(cool_setpoint=75),
+        )
+
+    asyncio.run(run())
+
+    assert thermostat.calls == [
+        ("state", {"hvac_mode": "cool"}),
+        ("preset", "away"),
+        ("state", {"cool_setpoint": 75}),
+    ]
+
+
+def test_failed_write_raises_for_every_merged_caller() -> None:
+    """Test each caller of a failed merged write gets the error."""
+    thermostat = FakeThermostat(APIError("rejected"))
+
+    async def run() -> None:
+        queue = _queue(thermostat)
+        results = await asyncio.gather(
+            queue.async_set_state(hvac_mode="heat"),
+            queue.async_set_state(heat_setpoint=70),
+            queue.async_set_preset_mode("home"),
+            return_exceptions=True,
+        )
+        assert [type(result) for result in results] == [APIError, APIError, type(None)]
+
+        # The queue keeps working after a failure.
+        thermostat.error = None
+        await queue.async_set_state(hvac_mode="off")
+
+    asyncio.run(run())
+
+    assert thermostat.calls[-2:] == [
+        ("preset", "home"),
+        ("state", {"hvac_mode": "off"}),
+    ]
+
+
+def test_cancelled_queue_cancels_waiting_callers() -> None:
+    """Test callers waiting on unsent commands are cancelled with the queue."""
+    thermostat = FakeThermostat()
+
+    async def run() -> None:
+        queue = _queue(thermostat)
+        queue._window = 10
+        write = asyncio.ensure_future(queue.async_set_state(hvac_mode="heat"))
+        # Let the write queue up and the queue task start waiting.
+        for _ in range(2):
+            await asyncio.sleep(0)
+        queue._task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await write
+
+    asyncio.run(run())
+
+    assert not thermostat.calls
@@ -0,0 +1,367 @@
+"""Tests for the data update coordinator of The Simple WiFi Thermostat."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.simple import coordinator as coordinator_module
+from custom_components.simple.const import METADATA_REVALIDATE_INTERVAL
+from custom_components.simple.coordinator import SimpleDataUpdateCoordinator
+from custom_components.simple.thesimple import (
+    APIError,
+    APITimeoutError,
+    AsyncTheSimpleThermostat,
+    AuthError,
+    SchemaError,
+)
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .conftest import METADATA, FakeResponse, make_client
+
+METADATA_KEY = "simple.entry.metadata"
+
+
+class FakeThermostat:
+    """Thermostat whose refresh succeeds or raises a given error."""
+
+    def __init__(self, thermostat_id: int, error: Exception | None = None) -> None:
+        """Initialize an idle thermostat."""
+        self.thermostat_id = thermostat_id
+        self.location_id = 10
+        self.hvacState = "idle"
+        self.connected = True
+        self.current_temp_deadband = None
+        self.error = error
+        self.changed: frozenset[str] = frozenset()
+        self.refreshes = 0
+
+    async def refresh(self) -> frozenset[str]:
+        """Count the refresh and raise the configured error, if any."""
+        self.refreshes += 1
+        if self.error is not None:
+            raise self.error
+        return self.changed
+
+
+@pytest.fixture
+def make_coordinator(monkeypatch: pytest.MonkeyPatch, storage: dict[str, Any]):
+    """Return a factory of coordinators polling the given thermostats."""
+    monkeypatch.setattr(
+        coordinator_module,
+        "async_track_time_interval",
+        lambda hass, action, interval: lambda: None,
+    )
+
+    def make(*thermostats, client=None) -> SimpleDataUpdateCoordinator:
+        if client is None:
+            client = SimpleNamespace(
+                retry_delay=lambda: 0, token_expires_in=lambda: None
+            )
+        hass = SimpleNamespace(config_entries=MagicMock())
+        entry = SimpleNamespace(
+            entry_id="entry",
+            options={},
+            async_on_unload=lambda func: None,
+            background_tasks=[],
+        )
+
+        def create_background_task(hass, target, name) -> None:
+            entry.background_tasks.append(target.__name__)
+            target.close()
+
+        entry.async_create_background_task = create_background_task
+        coordinator = SimpleDataUpdateCoordinator(hass, entry, client)
+        coordinator.thermostats = {t.thermostat_id: t for t in thermostats}
+        return coordinator
+
+    return make
+
+
+def _poll(coordinator: SimpleDataUpdateCoordinator, *thermostat_ids: int) -> float:
+    """Poll the given thermostats now and return the next update interval."""
+    for thermostat_id in thermostat_ids:
+        coordinator.async_mark_due(thermostat_id)
+    asyncio.run(coordinator._async_update_data())
+    return coordinator.update_interval.total_seconds()
+
+
+def test_idle_thermostat_backs_off(make_coordinator) -> None:
+    """Test an unchanged thermostat is polled less often, up to the maximum."""
+    thermostat = FakeThermostat(1)
+    coordinator = make_coordinator(thermostat)
+
+    intervals = [_poll(coordinator, 1) for _ in range(4)]
+    assert intervals == pytest.approx([120, 240, 300, 300], abs=1)
+
+    thermostat.changed = frozenset({"current_temp"})
+    assert _poll(coordinator, 1) == pytest.approx(60, abs=1)
+    assert coordinator.changed_ids == {1}
+
+
+@pytest.mark.parametrize(
+    ("hvac_state", "connected", "interval"),
+    [("heat", True, 30), ("cool", True, 30), ("idle", False, 300)],
+)
+def test_poll_interval_follows_activity(
+    make_coordinator, hvac_state: str, connected: bool, interval: int
+) -> None:
+    """Test active thermostats are polled fastest and disconnected ones slowest."""
+    thermostat = FakeThermostat(1)
+    thermostat.hvacState = hvac_state
+    thermostat.connected = connected
+    coordinator = make_coordinator(thermostat)
+
+    assert _poll(coordinator) == pytest.approx(interval, abs=1)
+
+
+def test_only_due_thermostats_are_polled(make_coordinator) -> None:
+    """Test the update interval follows the thermostat due first."""
+    active = FakeThermostat(1)
+    active.hvacState = "heat"
+    idle = FakeThermostat(2)
+    coordinator = make_coordinator(active, idle)
+
+    assert _poll(coordinator) == pytest.approx(30, abs=1)
+    assert _poll(coordinator) == pytest.approx(30, abs=1)
+    assert (active.refreshes, idle.refreshes) == (1, 1)
+
+
+def test_changed_ids_list_only_changed_thermostats(make_coordinator) -> None:
+    """Test listeners learn which thermostats changed in the last update."""
+    changing = FakeThermostat(1)
+    changing.changed = frozenset({"hvac_state"})
+    coordinator = make_coordinator(changing, FakeThermostat(2))
+
+    _poll(coordinator, 1, 2)
+    assert coordinator.changed_ids == {1}
+
+    changing.changed = frozenset()
+    _poll(coordinator, 1, 2)
+    assert coordinator.changed_ids == set()
+
+
+def test_failing_thermostat_is_unavailable_alone(make_coordinator) -> None:
+    """Test one failing thermostat does not fail the whole update."""
+    failing = FakeThermostat(2, APIError("unreachable", transient=True))
+    coordinator = make_coordinator(FakeThermostat(1), failing)
+
+    result = asyncio.run(coordinator._async_update_data())
+
+    assert result == coordinator.thermostats
+    assert coordinator.failed_ids == {2}
+    assert failing.refreshes == coordinator_module.UPDATE_RETRIES
+
+
+def test_failing_due_thermostats_do_not_fail_update(make_coordinator) -> None:
+    """Test the update succeeds while a thermostat that was not due is healthy."""
+    coordinator = make_coordinator(
+        FakeThermostat(1), FakeThermostat(2, APIError("unreachable"))
+    )
+    asyncio.run(coordinator._async_update_data())
+
+    # Only the failing thermostat is due now, the healthy one backed off.
+    coordinator.async_mark_due(2)
+    asyncio.run(coordinator._async_update_data())
+
+    assert coordinator.thermostats[1].refreshes == 1
+    assert coordinator.failed_ids == {2}
+
+
+def test_all_thermostats_failing_fails_update(make_coordinator) -> None:
+    """Test the update fails once every thermostat is failing."""
+    coordinator = make_coordinator(
+        FakeThermostat(1, APIError("down")), FakeThermostat(2, APIError("down"))
+    )
+
+    with pytest.raises(UpdateFailed):
+        asyncio.run(coordinator._async_update_data())
+    assert coordinator.failed_ids == {1, 2}
+
+
+def test_recovered_thermostat_is_available_again(make_coordinator) -> None:
+    """Test a thermostat that refreshes again is no longer failed."""
+    failing = FakeThermostat(2, APIError("unreachable"))
+    coordinator = make_coordinator(FakeThermostat(1), failing)
+    asyncio.run(coordinator._async_update_data())
+
+    failing.error = None
+    coordinator.async_mark_due(2)
+    asyncio.run(coordinator._async_update_data())
+
+    assert not coordinator.failed_ids
+
+
+def test_rejected_credentials_stop_polling(make_coordinator) -> None:
+    """Test rejected credentials fail the entry without retrying."""
+    thermostat = FakeThermostat(1, AuthError("invalid credentials"))
+    coordinator = make_coordinator(thermostat)
+
+    with pytest.raises(ConfigEntryError):
+        asyncio.run(coordinator._async_update_data())
+    assert thermostat.refreshes == 1
+    assert coordinator.update_interval is None
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        APIError("Invalid HTTP response (code: 404)"),
+        SchemaError("State response is missing the 'temp' field"),
+    ],
+)
+def test_deterministic_errors_are_not_retried(make_coordinator, error) -> None:
+    """Test errors that would fail the same way again are not retried."""
+    failing = FakeThermostat(2, error)
+    coordinator = make_coordinator(FakeThermostat(1), failing)
+
+    asyncio.run(coordinator._async_update_data())
+
+    assert failing.refreshes == 1
+    assert coordinator.failed_ids == {2}
+
+
+def test_only_transient_errors_are_retried(make_coordinator) -> None:
+    """Test a transient error is retried while a deterministic one is not."""
+    missing = FakeThermostat(1, APIError("Invalid HTTP response (code: 404)"))
+    busy = FakeThermostat(
+        2, APIError("Invalid HTTP response (code: 503)", transient=True)
+    )
+    coordinator = make_coordinator(missing, busy, FakeThermostat(3))
+
+    asyncio.run(coordinator._async_update_data())
+
+    assert missing.refreshes == 1
+    assert busy.refreshes == coordinator_module.UPDATE_RETRIES
+    assert coordinator.failed_ids == {1, 2}
+
+
+def test_stalled_api_is_not_retried(make_coordinator) -> None:
+    """Test the update gives up at once when every refresh timed out."""
+    coordinator = make_coordinator(
+        FakeThermostat(1, APITimeoutError("timed out")),
+        FakeThermostat(2, APITimeoutError("timed out")),
+    )
+
+    with pytest.raises(UpdateFailed):
+        asyncio.run(coordinator._async_update_data())
+    assert coordinator.thermostats[1].refreshes == 1
+
+
+async def _account(method, path, headers) -> FakeResponse:
+    """Answer requests for an account with thermostats 1 and 3 at location 10."""
+    if path == "user":
+        return FakeResponse(200, {"location_id_list": [10]})
+    if path == "location/10":
+        return FakeResponse(200, {"thermostatIdList": [1, 3]})
+    return FakeResponse(200, METADATA)
+
+
+def _cache(storage: dict[str, Any], thermostat_ids, age: float) -> None:
+    """Store cached metadata of the given thermostats at location 10."""
+    storage[METADATA_KEY] = {
+        "version": 1,
+        "updated_at": time.time() - age,
+        "thermostats": [
+            {"thermostat_id": tid, "location_id": 10, "metadata": METADATA}
+            for tid in thermostat_ids
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    ("age", "task"),
+    [
+        (0, "_async_sync_thermostats"),
+        (
+            METADATA_REVALIDATE_INTERVAL.total_seconds() + 1,
+            "_async_revalidate_metadata",
+        ),
+    ],
+)
+def test_cached_startup(make_coordinator, storage, age, task) -> None:
+    """Test setup uses the cache and fetches all metadata only once it is stale."""
+    client = make_client(_account)
+    _cache(storage, [1, 3], age)
+    coordinator = make_coordinator(client=client)
+
+    asyncio.run(coordinator._async_setup())
+
+    assert set(coordinator.thermostats) == {1, 3}
+    assert coordinator.config_entry.background_tasks == [task]
+    assert not client._session.requests
+
+
+def test_sync_fetches_metadata_of_new_thermostats(make_coordinator, storage) -> None:
+    """Test the startup sync only loads the metadata of added thermostats."""
+    client = make_client(_account)
+    _cache(storage, [1, 2], 60)
+    updated_at = storage[METADATA_KEY]["updated_at"]
+    coordinator = make_coordinator(client=client)
+    asyncio.run(coordinator._async_setup())
+
+    asyncio.run(coordinator._async_sync_thermostats())
+
+    assert client._session.count("GET", "thermostat/1") == 0
+    assert client._session.count("GET", "thermostat/3") == 1
+    cached = storage[METADATA_KEY]
+    assert [t["thermostat_id"] for t in cached["thermostats"]] == [1, 3]
+    assert cached["updated_at"] == updated_at
+    coordinator.hass.config_entries.async_schedule_reload.assert_called_once_with(
+        "entry"
+    )
+
+
+def test_sync_without_changes_keeps_cache(make_coordinator, storage) -> None:
+    """Test the startup sync does nothing more when the thermostats are the same."""
+    client = make_client(_account)
+    coordinator = make_coordinator(client=client)
+    for thermostat_id in (1, 3):
+        thermostat = AsyncTheSimpleThermostat(client, thermostat_id, 10)
+        thermostat.restore_metadata(METADATA)
+        coordinator.thermostats[thermostat_id] = thermostat
+
+    asyncio.run(coordinator._async_sync_thermostats())
+
+    assert client._session.requests == [("GET", "user"), ("GET", "location/10")]
+    assert METADATA_KEY not in storage
+    coordinator.hass.config_entries.async_schedule_reload.assert_not_called()
+
+
+def test_token_renewed_before_expiry(
+    make_coordinator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the token renewal is scheduled ahead of expiry and retried on failure."""
+    scheduled: list[float] = []
+    monkeypatch.setattr(
+        coordinator_module,
+        "async_call_later",
+        lambda hass, delay, action: scheduled.append(delay) or (lambda: None),
+    )
+    errors = [APIError("unavailable", transient=True), None, AuthError("rejected")]
+
+    async def renew_token() -> None:
+        if (error := errors.pop(0)) is not None:
+            raise error
+
+    client = SimpleNamespace(
+        retry_delay=lambda: 0, token_expires_in=lambda: 600.0, renewToken=renew_token
+    )
+    coordinator = make_coordinator(FakeThermostat(1), client=client)
+
+    async def run() -> None:
+        coordinator._schedule_token_renewal()
+        for _ in range(3):
+            await coordinator._async_renew_token(None)
+
+    asyncio.run(run())
+
+    # Renewed 2 minutes ahead, retried after a minute, never after a rejection.
+    assert scheduled == [480.0, 60.0, 480.0]
+    assert coordinator._unsub_token_renewal is None
@@ -0,0 +1,75 @@
+"""Tests for the redacted debug logging of the TheSimple/Ecofactor client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from custom_components.simple.thesimple import (
+    MAX_LOGGED_PAYLOAD,
+    APIError,
+    _LogPayload,
+)
+
+from .conftest import FakeResponse, make_client
+
+SECRET = "s3cr3t-value"
+
+
+def test_text_payload_redacted() -> None:
+    """Test secret fields are masked in a raw JSON body, whatever their case."""
+    body = json.dumps(
+        {"Access_Token": SECRET, "user": {"refresh_token": SECRET}, "user_id": 7}
+    ).encode()
+
+    text = str(_LogPayload(body))
+
+    assert SECRET not in text
+    assert text.count("**REDACTED**") == 2
+    assert '"user_id": 7' in text
+
+
+def test_decoded_payload_redacted() -> None:
+    """Test secret fields are masked in decoded JSON, including nested lists."""
+    payload = {"username": "user", "password": SECRET, "items": [{"encryptedpass": 1}]}
+
+    text = str(_LogPayload(payload))
+
+    assert SECRET not in text
+    assert "'user'" in text
+    assert payload["password"] == SECRET
+
+
+def test_long_payload_truncated() -> None:
+    """Test long payloads are cut off with their full length noted."""
+    text = str(_LogPayload("x" * (MAX_LOGGED_PAYLOAD + 10)))
+
+    assert text.endswith(f"... ({MAX_LOGGED_PAYLOAD + 10} characters)")
+    assert len(text) < MAX_LOGGED_PAYLOAD + 30
+
+
+def test_token_grant_not_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test neither debug logs nor errors of a token grant contain the tokens."""
+    responses = [
+        FakeResponse(200, {"access_token": SECRET, "refresh_token": SECRET}),
+        FakeResponse(500, {"error": "failed", "refresh_token": SECRET}),
+    ]
+
+    async def handler(method, path, headers):
+        return responses.pop(0)
+
+    async def run() -> None:
+        client = make_client(handler)
+        await client.refreshAccessToken()
+        with pytest.raises(APIError) as err:
+            await client.refreshAccessToken()
+        assert SECRET not in str(err.value)
+
+    with caplog.at_level(logging.DEBUG, "custom_components.simple"):
+        asyncio.run(run())
+
+    assert "refreshAccessToken" in caplog.text
+    assert SECRET not in caplog.text
@@ -0,0 +1,103 @@
+"""Tests for the decoding of TheSimple/Ecofactor API responses."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.simple.thesimple import (
+    THERMOSTAT_DATA,
+    AsyncTheSimpleThermostat,
+    AwaySettings,
+    Location,
+    SchemaError,
+    ThermostatMetadata,
+    ThermostatState,
+    UserInfo,
+    _json_loads,
+)
+
+from .conftest import METADATA, FakeResponse, make_client, state_response
+
+
+def test_state_decoded() -> None:
+    """Test a state response decodes into a snapshot."""
+    response = state_response(temperature="70.46", hvac_state="heat")
+    response["away_details"] = {"end_ts": "2050-12-31T00:00:00+00:00"}
+
+    state = ThermostatState.from_json(response)
+
+    assert state.current_temp == 70.5
+    assert state.hvac_state == "heat"
+    assert state.preset_mode == "away"
+    assert state.away_end_ts == "2050-12-31T00:00:00+00:00"
+    assert ThermostatState.from_json(state_response()).preset_mode == "none"
+
+
+@pytest.mark.parametrize(
+    ("response", "message"),
+    [
+        ({THERMOSTAT_DATA: {}, "away_details": {}}, "missing the 'connected'"),
+        ({**state_response(), THERMOSTAT_DATA: []}, f"invalid {THERMOSTAT_DATA!r}"),
+        (state_response(temperature="warm"), "invalid 'temperature'"),
+        (state_response(temperature=None), "invalid 'temperature'"),
+    ],
+)
+def test_malformed_state_rejected(response, message: str) -> None:
+    """Test a malformed state response raises SchemaError naming the field."""
+    with pytest.raises(SchemaError, match=message):
+        ThermostatState.from_json(response)
+
+
+def test_metadata_round_trip() -> None:
+    """Test metadata survives being saved in the shape of a response."""
+    metadata = ThermostatMetadata.from_json(METADATA)
+
+    assert metadata.supported_modes == ("heat", "cool", "auto", "off")
+    assert ThermostatMetadata.from_json(metadata.to_json()) == metadata
+
+    with pytest.raises(SchemaError, match="'model'"):
+        ThermostatMetadata.from_json({**METADATA, "model": None})
+
+
+def test_account_responses_decoded() -> None:
+    """Test user, location and away settings responses decode."""
+    assert UserInfo.from_json({"location_id_list": [10, 11]}).location_ids == (10, 11)
+    assert Location.from_json({"thermostatIdList": [1]}).thermostat_ids == (1,)
+    assert AwaySettings.from_json(
+        {"cool_setpoint": 82, "heat_setpoint": "60"}
+    ) == AwaySettings(82.0, 60.0)
+
+    with pytest.raises(SchemaError):
+        UserInfo.from_json({"location_id_list": "10"})
+    with pytest.raises(SchemaError):
+        Location.from_json([])
+
+
+def test_invalid_json_rejected() -> None:
+    """Test a body that is not JSON raises SchemaError."""
+    assert _json_loads(b'{"a": 1}') == {"a": 1}
+    with pytest.raises(SchemaError):
+        _json_loads(b"<html>")
+
+
+def test_malformed_refresh_keeps_state() -> None:
+    """Test a refresh with a malformed response fails without touching the state."""
+    responses = [state_response(), {"connected": True}]
+
+    async def handler(method, path, headers):
+        return FakeResponse(200, responses.pop(0))
+
+    async def run() -> None:
+        client = make_client(handler, read_reuse_window=0)
+        thermostat = AsyncTheSimpleThermostat(client, 1, 10)
+        await thermostat.refresh()
+        state = thermostat.state
+
+        with pytest.raises(SchemaError) as err:
+            await thermostat.refresh()
+        assert not err.value.transient
+        assert thermostat.state is state
+
+    asyncio.run(run())
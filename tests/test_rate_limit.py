@@ -0,0 +1,72 @@
+"""Tests for the request rate limiting of the TheSimple/Ecofactor client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.simple.thesimple import (
+    ENDPOINT_READ,
+    ENDPOINT_WRITE,
+    _operation_deadline,
+    _RateLimiter,
+)
+
+from .conftest import FakeClock, FakeResponse, make_client
+
+
+def test_limiter_sends_writes_ahead_of_reads(clock: FakeClock) -> None:
+    """Test a queued write goes before a read that was queued earlier."""
+    limiter = _RateLimiter(rate=1, burst=1)
+    first = limiter.enqueue(ENDPOINT_READ)
+    assert limiter.try_acquire(first) is None
+
+    read = limiter.enqueue(ENDPOINT_READ)
+    write = limiter.enqueue(ENDPOINT_WRITE)
+    assert limiter.stats()["queued_reads"] == 1
+    assert limiter.stats()["queued_writes"] == 1
+
+    clock.advance(1)
+    assert limiter.try_acquire(read) == pytest.approx(1)
+    assert limiter.try_acquire(write) is None
+
+    clock.advance(1)
+    assert limiter.try_acquire(read) is None
+
+    stats = limiter.stats()
+    assert stats["requests"] == 3
+    assert stats["delayed_requests"] == 2
+    assert stats["max_wait"] == pytest.approx(2)
+    assert stats["max_queued"] == 2
+
+
+def test_limiter_cancel_drops_ticket(clock: FakeClock) -> None:
+    """Test a request that gives up waiting leaves the queue."""
+    limiter = _RateLimiter(rate=1, burst=1)
+    limiter.try_acquire(limiter.enqueue(ENDPOINT_READ))
+
+    write = limiter.enqueue(ENDPOINT_WRITE)
+    read = limiter.enqueue(ENDPOINT_READ)
+    limiter.cancel(write)
+
+    clock.advance(1)
+    assert limiter.try_acquire(read) is None
+
+
+def test_limiter_wait_does_not_count_against_deadline() -> None:
+    """Test a request queued past its operation deadline is still sent."""
+
+    async def handler(method, path, headers):
+        return FakeResponse(200, {})
+
+    async def run() -> None:
+        client = make_client(handler, rate=10, burst=1)
+        await client.http_request("GET", "thermostat/1/state", None, True)
+        with _operation_deadline(0.05):
+            assert (
+                await client.http_request("GET", "thermostat/2/state", None, True) == {}
+            )
+        assert client.rate_limit_stats()["max_wait"] > 0.05
+
+    asyncio.run(run())
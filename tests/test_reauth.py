@@ -0,0 +1,176 @@
+"""Tests for the token renewal of the TheSimple/Ecofactor client."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+
+import pytest
+
+from custom_components.simple.thesimple import APIError
+
+from .conftest import (
+    ACCESS_TOKEN,
+    PUBLIC_KEY_PEM,
+    RENEWED_TOKEN,
+    FakeResponse,
+    make_client,
+)
+
+STATE_URL = "thermostat/1/state"
+
+
+pytestmark = pytest.mark.usefixtures("no_cached_public_key")
+
+
+class FakeAPI:
+    """Handler that refuses refresh grants and accepts each nonce only once."""
+
+    def __init__(self, accept_old_token: bool) -> None:
+        """Initialize the API, optionally still accepting the first token."""
+        self.accept_old_token = accept_old_token
+        self.issued = 0
+        self.used: set[str] = set()
+
+    async def __call__(self, method, path, headers) -> FakeResponse:
+        """Answer a request."""
+        if path == "authenticate/refresh_token":
+            return FakeResponse(400, {"error": "invalid_grant"})
+        if path == "public_key":
+            await asyncio.sleep(0.02)
+            return FakeResponse(200, {"public_key": PUBLIC_KEY_PEM})
+        if path == "authenticate/nonce":
+            self.issued += 1
+            challenge = f'DigestE realm="Consumer", nonce="n{self.issued}", opaque="op"'
+            return FakeResponse(200, {"WWW-Authenticate": challenge})
+        if path == "authenticate":
+            nonce = re.search(r'nonce="(\w+)"', headers["Authorization"]).group(1)
+            if nonce in self.used:
+                return FakeResponse(401, {"error": "nonce reused"})
+            self.used.add(nonce)
+            return FakeResponse(200, {"access_token": RENEWED_TOKEN, "user_id": 1})
+
+        token = headers.get("Authorization")
+        if token == f"Bearer {RENEWED_TOKEN}" or (
+            self.accept_old_token and token == f"Bearer {ACCESS_TOKEN}"
+        ):
+            return FakeResponse(200, {"token": token})
+        return FakeResponse(401, {"error": "expired"})
+
+
+def test_concurrent_rejections_renew_token_once() -> None:
+    """Test N requests rejected at once share a single token renewal."""
+
+    async def handler(method, path, headers):
+        if path == "authenticate/refresh_token":
+            await asyncio.sleep(0.01)
+            return FakeResponse(200, {"access_token": RENEWED_TOKEN})
+        if headers.get("Authorization") == f"Bearer {ACCESS_TOKEN}":
+            await asyncio.sleep(0.01)
+            return FakeResponse(401, {"error": "expired"})
+        return FakeResponse(200, {"path": path})
+
+    async def run() -> None:
+        client = make_client(handler)
+        paths = [f"thermostat/{tid}/state" for tid in range(5)]
+
+        results = await asyncio.gather(
+            *(client.http_request("GET", path, None, True) for path in paths)
+        )
+
+        assert results == [{"path": path} for path in paths]
+        assert client._session.count("POST", "authenticate/refresh_token") == 1
+        assert client._session.count("GET", "authenticate/nonce") == 0
+
+    asyncio.run(run())
+
+
+def test_background_renewal_and_rejected_poll_share_handshake() -> None:
+    """Test a scheduled renewal and a rejected poll run one handshake together."""
+    api = FakeAPI(accept_old_token=False)
+
+    async def run() -> None:
+        client = make_client(api)
+
+        renewal = asyncio.create_task(client.renewToken())
+        await asyncio.sleep(0)
+        poll, _ = await asyncio.gather(
+            client.http_request("GET", STATE_URL, None, True),
+            client.renewToken(),
+        )
+        await renewal
+
+        assert poll == {"token": f"Bearer {RENEWED_TOKEN}"}
+        session = client._session
+        assert session.count("POST", "authenticate/refresh_token") == 1
+        assert session.count("GET", "authenticate/nonce") == 1
+        assert session.count("POST", "authenticate") == 1
+
+    asyncio.run(run())
+
+
+def test_old_token_kept_during_handshake() -> None:
+    """Test polls keep using the current token until the new one is received."""
+    api = FakeAPI(accept_old_token=True)
+
+    async def run() -> None:
+        client = make_client(api)
+
+        renewal = asyncio.create_task(client.renewToken())
+        await asyncio.sleep(0.01)
+        assert await client.http_request("GET", STATE_URL, None, True) == {
+            "token": f"Bearer {ACCESS_TOKEN}"
+        }
+        await renewal
+
+        assert client._token == RENEWED_TOKEN
+        assert not client._refreshToken
+
+    asyncio.run(run())
+
+
+def test_concurrent_handshakes_use_their_own_nonce() -> None:
+    """Test two logins at once each answer the nonce they were given."""
+    api = FakeAPI(accept_old_token=False)
+
+    async def run() -> None:
+        client = make_client(api)
+
+        await asyncio.gather(
+            client.auth("user", "password"), client.auth("user", "password")
+        )
+
+        assert api.used == {"n1", "n2"}
+        assert client._token == RENEWED_TOKEN
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    ("status", "handshakes", "refresh_token"),
+    [(400, 1, ""), (401, 1, ""), (429, 0, "refresh"), (503, 0, "refresh")],
+)
+def test_refused_refresh_falls_back_to_handshake(
+    status: int, handshakes: int, refresh_token: str
+) -> None:
+    """Test only a refused refresh grant falls back to the full handshake."""
+    api = FakeAPI(accept_old_token=False)
+
+    async def handler(method, path, headers):
+        if path == "authenticate/refresh_token":
+            return FakeResponse(status, {"error": "refused"})
+        return await api(method, path, headers)
+
+    async def run() -> None:
+        client = make_client(handler)
+        if handshakes:
+            await client.renewToken()
+            assert client._token == RENEWED_TOKEN
+        else:
+            with pytest.raises(APIError):
+                await client.renewToken()
+            assert client._token == ACCESS_TOKEN
+        assert client._refreshToken == refresh_token
+        assert client._session.count("POST", "authenticate") == handshakes
+
+    asyncio.run(run())
@@ -0,0 +1,76 @@
+"""Tests for the shared reads of the TheSimple/Ecofactor client."""
+
+from __future__ import annotations
+
+import asyncio
+
+from .conftest import FakeResponse, make_client
+
+STATE_URL = "thermostat/1/state"
+
+
+def test_concurrent_reads_share_one_request() -> None:
+    """Test N overlapping GETs of the same URL send one request."""
+
+    async def handler(method, path, headers):
+        await asyncio.sleep(0.01)
+        return FakeResponse(200, {"temperature": 70})
+
+    async def run() -> None:
+        client = make_client(handler)
+
+        results = await asyncio.gather(
+            *(client.http_request("GET", STATE_URL, None, True) for _ in range(5))
+        )
+        assert results == [{"temperature": 70}] * 5
+        assert client._session.count("GET", STATE_URL) == 1
+
+        # Reused within the window, sent again once it is off.
+        await client.http_request("GET", STATE_URL, None, True)
+        assert client._session.count("GET", STATE_URL) == 1
+
+        client._read_reuse_window = 0
+        await client.http_request("GET", STATE_URL, None, True)
+        assert client._session.count("GET", STATE_URL) == 2
+
+    asyncio.run(run())
+
+
+def test_write_discards_reused_reads() -> None:
+    """Test a read after a write is not answered by an earlier read."""
+
+    async def handler(method, path, headers):
+        return FakeResponse(200, {} if method == "GET" else None)
+
+    async def run() -> None:
+        client = make_client(handler)
+
+        await client.http_request("GET", STATE_URL, None, True)
+        await client.http_request("PATCH", STATE_URL, {"hvac_mode": "cool"}, True)
+        await client.http_request("GET", STATE_URL, None, True)
+        assert client._session.count("GET", STATE_URL) == 2
+
+    asyncio.run(run())
+
+
+def test_write_discards_in_flight_reads() -> None:
+    """Test a read after a write does not join a read sent before it."""
+
+    async def handler(method, path, headers):
+        await asyncio.sleep(0.01)
+        return FakeResponse(200, {} if method == "GET" else None)
+
+    async def run() -> None:
+        client = make_client(handler)
+
+        in_flight = asyncio.create_task(
+            client.http_request("GET", STATE_URL, None, True)
+        )
+        await asyncio.sleep(0)
+        await client.http_request("PATCH", STATE_URL, {"hvac_mode": "heat"}, True)
+        await asyncio.gather(
+            in_flight, client.http_request("GET", STATE_URL, None, True)
+        )
+        assert client._session.count("GET", STATE_URL) == 2
+
+    asyncio.run(run())
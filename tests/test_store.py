@@ -0,0 +1,92 @@
+"""Tests for the persistent stores of The Simple WiFi Thermostat."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from custom_components.simple.const import METADATA_REVALIDATE_INTERVAL
+from custom_components.simple.store import SimpleMetadataStore, SimpleSessionStore
+from custom_components.simple.thesimple import AsyncTheSimpleThermostat
+
+from .conftest import ACCESS_TOKEN, METADATA, make_client
+
+ENTRY = SimpleNamespace(entry_id="entry")
+METADATA_KEY = "simple.entry.metadata"
+SESSION_KEY = "simple.entry.session"
+
+
+def _thermostat(thermostat_id: int) -> AsyncTheSimpleThermostat:
+    """Return a thermostat at location 10 with metadata restored."""
+    thermostat = AsyncTheSimpleThermostat(make_client(None), thermostat_id, 10)
+    thermostat.restore_metadata(METADATA)
+    return thermostat
+
+
+def test_metadata_round_trip(storage: dict[str, Any]) -> None:
+    """Test saved metadata loads back the same and is fresh."""
+
+    async def run() -> None:
+        await SimpleMetadataStore(None, ENTRY).async_save([_thermostat(1)])
+
+        store = SimpleMetadataStore(None, ENTRY)
+        assert store.is_stale
+        assert await store.async_load() == [
+            {"thermostat_id": 1, "location_id": 10, "metadata": METADATA}
+        ]
+        assert not store.is_stale
+
+    asyncio.run(run())
+
+
+def test_metadata_stale_after_interval(storage: dict[str, Any]) -> None:
+    """Test metadata saved with an old fetch time is stale."""
+    store = SimpleMetadataStore(None, ENTRY)
+    updated_at = time.time() - METADATA_REVALIDATE_INTERVAL.total_seconds() - 1
+
+    asyncio.run(store.async_save([_thermostat(1)], updated_at))
+
+    assert store.is_stale
+    assert storage[METADATA_KEY]["updated_at"] == updated_at
+
+
+def test_metadata_of_other_version_ignored(storage: dict[str, Any]) -> None:
+    """Test a cache written by another version is not used."""
+    storage[METADATA_KEY] = {"version": 0, "thermostats": [{"thermostat_id": 1}]}
+
+    assert asyncio.run(SimpleMetadataStore(None, ENTRY).async_load()) is None
+
+
+def test_session_round_trip(storage: dict[str, Any]) -> None:
+    """Test a saved session restores the client without a handshake."""
+    store = SimpleSessionStore(None, ENTRY)
+    store.async_schedule_save(make_client(None))
+
+    client = make_client(None)
+    client.clearToken()
+    session = asyncio.run(SimpleSessionStore(None, ENTRY).async_load())
+
+    assert client.restore_session(session, "user", "password")
+    assert client._token == ACCESS_TOKEN
+    assert store._store.private
+
+
+def test_session_of_unauthenticated_client_not_restored(
+    storage: dict[str, Any],
+) -> None:
+    """Test nothing is restored after saving a client without a token."""
+    client = make_client(None)
+    client.clearToken()
+    SimpleSessionStore(None, ENTRY).async_schedule_save(client)
+
+    assert asyncio.run(SimpleSessionStore(None, ENTRY).async_load()) is None
+
+
+def test_session_in_old_format_not_restored(storage: dict[str, Any]) -> None:
+    """Test an encrypted session saved by an earlier version is not used."""
+    storage[SESSION_KEY] = {"salt": "c2FsdA==", "session": "gAAAAABencrypted"}
+    session = asyncio.run(SimpleSessionStore(None, ENTRY).async_load())
+
+    assert not make_client(None).restore_session(session, "user", "password")
@@ -0,0 +1,231 @@
+"""Tests for the blocking TheSimple/Ecofactor client."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from custom_components.simple import thesimple
+from custom_components.simple.thesimple import TheSimpleClient, TheSimpleThermostat
+
+from .conftest import (
+    ACCESS_TOKEN,
+    BASE_URL,
+    METADATA,
+    PUBLIC_KEY_PEM,
+    RENEWED_TOKEN,
+    state_response,
+)
+
+
+class FakeSyncResponse:
+    """Response of a FakeRequestsSession request."""
+
+    def __init__(self, status: int = 200, body: Any = None) -> None:
+        """Initialize a response with a JSON body."""
+        self.status_code = status
+        self.headers: dict[str, str] = {}
+        self.content = b"" if body is None else json.dumps(body).encode()
+
+
+SyncHandler = Callable[[str, str, dict[str, str], Any], FakeSyncResponse]
+
+
+class FakeRequestsSession:
+    """Stand-in for requests.Session that records the requests it answers."""
+
+    def __init__(self, handler: SyncHandler) -> None:
+        """Initialize the session with the function that answers requests."""
+        self.handler = handler
+        self.headers: dict[str, str] = {}
+        self.requests: list[tuple[str, str, Any]] = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, json=None, headers=None, timeout=None):
+        """Answer a request from the handler, from any thread."""
+        path = url.removeprefix(BASE_URL)
+        with self._lock:
+            self.requests.append((method, path, json))
+        return self.handler(method, path, headers or {}, json)
+
+    def count(self, method: str, path: str) -> int:
+        """Return how many times a request was sent."""
+        with self._lock:
+            return sum(request[:2] == (method, path) for request in self.requests)
+
+
+@pytest.fixture
+def make_sync_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Callable[..., TheSimpleClient]:
+    """Return a factory of blocking clients with a restored session."""
+
+    def factory(handler: SyncHandler, **kwargs: Any) -> TheSimpleClient:
+        session = FakeRequestsSession(handler)
+        monkeypatch.setattr(thesimple.requests, "Session", lambda: session)
+        client = TheSimpleClient(BASE_URL, **kwargs)
+        client.restore_session(
+            {
+                "username": "user",
+                "access_token": ACCESS_TOKEN,
+                "refresh_token": "refresh",
+                "user_id": 1,
+                "location_ids": [10],
+            },
+            "user",
+            "password",
+        )
+        return client
+
+    return factory
+
+
+def test_concurrent_rejections_renew_token_once(make_sync_client) -> None:
+    """Test requests rejected on several threads share a single token renewal."""
+
+    def handler(method, path, headers, body):
+        if path == "authenticate/refresh_token":
+            time.sleep(0.02)
+            return FakeSyncResponse(200, {"access_token": RENEWED_TOKEN})
+        if headers.get("Authorization") == f"Bearer {ACCESS_TOKEN}":
+            time.sleep(0.02)
+            return FakeSyncResponse(401, {"error": "expired"})
+        return FakeSyncResponse(200, {"path": path})
+
+    client = make_sync_client(handler)
+    paths = [f"thermostat/{tid}/state" for tid in range(5)]
+
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        responses = list(
+            executor.map(
+                lambda path: client.http_request("GET", path, None, True), paths
+            )
+        )
+
+    assert [json.loads(r.content) for r in responses] == [
+        {"path": path} for path in paths
+    ]
+    assert client.httpSess.count("POST", "authenticate/refresh_token") == 1
+    assert client.httpSess.count("GET", "authenticate/nonce") == 0
+
+
+def test_concurrent_renewals_share_one_grant(make_sync_client) -> None:
+    """Test threads renewing the token at once send a single refresh grant."""
+    barrier = threading.Barrier(3)
+
+    def handler(method, path, headers, body):
+        time.sleep(0.05)
+        return FakeSyncResponse(200, {"access_token": RENEWED_TOKEN})
+
+    client = make_sync_client(handler)
+
+    def renew() -> None:
+        barrier.wait()
+        client.renewToken()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(lambda _: renew(), range(3)))
+
+    assert client._token == RENEWED_TOKEN
+    assert client._refreshToken == "refresh"
+    assert client.httpSess.requests == [
+        (
+            "POST",
+            "authenticate/refresh_token",
+            {"grant_type": "refresh_token", "refresh_token": "refresh"},
+        )
+    ]
+
+
+class FakeAuthAPI:
+    """Handler for the handshake that only answers the key once the nonce is sent."""
+
+    def __init__(self) -> None:
+        """Initialize the API."""
+        self.nonce_sent = threading.Event()
+        self.overlapped: list[bool] = []
+
+    def __call__(self, method, path, headers, body) -> FakeSyncResponse:
+        """Answer a handshake request."""
+        if path == "public_key":
+            self.overlapped.append(self.nonce_sent.wait(1))
+            return FakeSyncResponse(200, {"public_key": PUBLIC_KEY_PEM})
+        if path == "authenticate/nonce":
+            self.nonce_sent.set()
+            challenge = 'DigestE realm="Consumer", nonce="n1", opaque="op"'
+            return FakeSyncResponse(200, {"WWW-Authenticate": challenge})
+        return FakeSyncResponse(200, {"access_token": RENEWED_TOKEN, "user_id": 1})
+
+
+@pytest.mark.usefixtures("no_cached_public_key")
+def test_handshake_fetches_key_and_nonce_concurrently(make_sync_client) -> None:
+    """Test the public key and the nonce are requested at the same time."""
+    api = FakeAuthAPI()
+    client = make_sync_client(api)
+
+    client.auth("user", "password")
+
+    assert api.overlapped == [True]
+    assert client._token == RENEWED_TOKEN
+
+
+@pytest.mark.usefixtures("no_cached_public_key")
+def test_handshake_reuses_cached_public_key(make_sync_client) -> None:
+    """Test a second handshake against the same API skips the public key."""
+    api = FakeAuthAPI()
+    make_sync_client(api).auth("user", "password")
+    client = make_sync_client(api)
+
+    client.auth("user", "password")
+
+    assert client.httpSess.count("GET", "public_key") == 0
+    assert client.httpSess.count("GET", "authenticate/nonce") == 1
+
+
+def test_state_fields_sent_in_one_patch(make_sync_client) -> None:
+    """Test several state fields are written with a single PATCH."""
+
+    def handler(method, path, headers, body):
+        if method == "GET":
+            return FakeSyncResponse(200, state_response())
+        return FakeSyncResponse(204)
+
+    client = make_sync_client(handler)
+    thermostat = TheSimpleThermostat(client, 1, 10)
+    thermostat.restore_metadata(METADATA)
+    thermostat.refresh()
+
+    thermostat.set_temp(74, hvac_mode="cool")
+
+    assert client.httpSess.requests[-1] == (
+        "PATCH",
+        "thermostat/1/state",
+        {"hvac_mode": "cool", "cool_setpoint": 74},
+    )
+    assert client.httpSess.count("PATCH", "thermostat/1/state") == 1
+    assert (thermostat.hvacMode, thermostat.cool_setpoint) == ("cool", 74)
+
+
+def test_away_settings_cached_per_location(make_sync_client, clock) -> None:
+    """Test away settings are fetched once per location until they expire."""
+
+    def handler(method, path, headers, body):
+        return FakeSyncResponse(200, {"cool_setpoint": 82, "heat_setpoint": 60})
+
+    client = make_sync_client(handler)
+
+    client.getAwaySettings(10)
+    client.getAwaySettings(10)
+    client.getAwaySettings(11)
+    assert client.httpSess.count("GET", "location/10/away_settings") == 1
+    assert client.httpSess.count("GET", "location/11/away_settings") == 1
+
+    clock.advance(thesimple.AWAY_SETTINGS_TTL + 1)
+    assert client.getAwaySettings(10).cool_setpoint == 82
+    assert client.httpSess.count("GET", "location/10/away_settings") == 2
@@ -0,0 +1,193 @@
+"""Tests for the state handling of the TheSimple/Ecofactor thermostats."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from typing import Any
+
+import pytest
+
+from custom_components.simple import thesimple
+from custom_components.simple.thesimple import AsyncTheSimpleThermostat, ThermostatState
+
+from .conftest import METADATA, FakeResponse, make_client, state_response
+
+
+class FakeThermostatAPI:
+    """Handler that reports a settable thermostat state and accepts writes."""
+
+    def __init__(self) -> None:
+        """Start with the default state response."""
+        self.state: dict[str, Any] = {}
+
+    async def __call__(self, method, path, headers) -> FakeResponse:
+        """Answer a state request or accept a write."""
+        if method == "GET":
+            return FakeResponse(200, state_response(**self.state))
+        return FakeResponse(204)
+
+
+def _thermostat(api: FakeThermostatAPI) -> AsyncTheSimpleThermostat:
+    """Return a thermostat with metadata whose reads are never reused."""
+    client = make_client(api, read_reuse_window=0)
+    thermostat = AsyncTheSimpleThermostat(client, 1, 10)
+    thermostat.restore_metadata(METADATA)
+    return thermostat
+
+
+def test_local_state_kept_until_confirmed() -> None:
+    """Test a local change survives stale refreshes until it is reported."""
+    api = FakeThermostatAPI()
+    thermostat = _thermostat(api)
+
+    async def run() -> None:
+        await thermostat.refresh()
+        thermostat.set_local_state(heat_setpoint=70)
+        assert thermostat.heat_setpoint == 70
+        assert thermostat.pending_confirmation
+
+        assert await thermostat.refresh() == frozenset()
+        assert thermostat.heat_setpoint == 70
+        assert thermostat.pending_confirmation
+
+        api.state = {"heat_setpoint": 70}
+        await thermostat.refresh()
+        assert not thermostat.pending_confirmation
+
+        api.state = {"heat_setpoint": 66}
+        await thermostat.refresh()
+        assert thermostat.heat_setpoint == 66
+
+    asyncio.run(run())
+
+
+def test_auto_confirmed_by_auto_heat_or_cool() -> None:
+    """Test auto is confirmed when the thermostat reports autoheat."""
+    api = FakeThermostatAPI()
+    thermostat = _thermostat(api)
+
+    async def run() -> None:
+        await thermostat.refresh()
+        thermostat.set_local_state(hvac_mode="auto")
+
+        api.state = {"hvac_mode": "autoheat"}
+        await thermostat.refresh()
+        assert thermostat.hvacMode == "autoheat"
+        assert not thermostat.pending_confirmation
+
+    asyncio.run(run())
+
+
+def test_unconfirmed_local_state_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a change the thermostat never reports is dropped after the timeout."""
+    monkeypatch.setattr(thesimple, "OPTIMISTIC_STATE_TIMEOUT", -1)
+    api = FakeThermostatAPI()
+    thermostat = _thermostat(api)
+
+    async def run() -> None:
+        await thermostat.refresh()
+        thermostat.set_local_state(hvac_mode="off")
+
+        assert await thermostat.refresh() == frozenset({"hvac_mode"})
+        assert thermostat.hvacMode == "heat"
+        assert not thermostat.pending_confirmation
+
+    asyncio.run(run())
+
+
+def test_cleared_local_state_follows_refresh() -> None:
+    """Test the refreshed state wins once the local change is cleared."""
+    api = FakeThermostatAPI()
+    thermostat = _thermostat(api)
+
+    async def run() -> None:
+        await thermostat.refresh()
+        thermostat.set_local_state(cool_setpoint=74, fan_mode="on")
+        thermostat.clear_expected_state()
+
+        await thermostat.refresh()
+        assert (thermostat.cool_setpoint, thermostat.fan_mode) == (76, "auto")
+
+    asyncio.run(run())
+
+
+def test_local_preset_kept_until_confirmed() -> None:
+    """Test a local away preset is kept until the thermostat reports it."""
+    api = FakeThermostatAPI()
+    thermostat = _thermostat(api)
+
+    async def run() -> None:
+        await thermostat.refresh()
+        thermostat.set_local_preset_mode("away")
+
+        await thermostat.refresh()
+        assert thermostat.preset_mode == "away"
+        assert thermostat.pending_confirmation
+
+    asyncio.run(run())
+
+
+def test_invalid_local_state_rejected() -> None:
+    """Test a setpoint outside the thermostat range is not applied."""
+    thermostat = _thermostat(FakeThermostatAPI())
+
+    with pytest.raises(thesimple.TheSimpleError):
+        thermostat.set_local_state(heat_setpoint=95)
+    assert not thermostat.pending_confirmation
+
+
+def test_refresh_reports_changed_fields() -> None:
+    """Test a refresh returns the changed fields, and nothing if none changed."""
+    api = FakeThermostatAPI()
+    thermostat = _thermostat(api)
+
+    async def run() -> None:
+        assert "current_temp" in await thermostat.refresh()
+        assert await thermostat.refresh() == frozenset()
+
+        api.state = {"hvac_state": "heat", "temperature": 70.4}
+        assert await thermostat.refresh() == frozenset({"hvac_state", "current_temp"})
+
+    asyncio.run(run())
+
+
+def test_state_snapshots_are_immutable() -> None:
+    """Test a snapshot cannot change under its readers and ignores its age."""
+    state = ThermostatState.from_json(state_response())
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        state.current_temp = 71.0
+    assert state == dataclasses.replace(state, last_update=0.0)
+    assert state.changed_fields(dataclasses.replace(state, fan_mode="on")) == {
+        "fan_mode"
+    }
+
+
+def test_thermostat_has_no_instance_dict() -> None:
+    """Test thermostats keep their attributes in slots."""
+    thermostat = _thermostat(FakeThermostatAPI())
+
+    assert not hasattr(thermostat, "__dict__")
+    with pytest.raises(AttributeError):
+        thermostat.unknown = True
+
+
+def test_temperature_deadband_ignores_noise() -> None:
+    """Test current temperature changes within the deadband are not changes."""
+    api = FakeThermostatAPI()
+    thermostat = _thermostat(api)
+    thermostat.current_temp_deadband = 0.5
+
+    async def run() -> None:
+        await thermostat.refresh()
+
+        api.state = {"temperature": 70.3}
+        assert await thermostat.refresh() == frozenset()
+        assert thermostat.current_temp == 70.0
+
+        api.state = {"temperature": 70.6}
+        assert await thermostat.refresh() == frozenset({"current_temp"})
+        assert thermostat.current_temp == 70.6
+
+    asyncio.run(run())